@@ -27,9 +27,24 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from app.database import Base
 from app import models
+from app.partitions import is_partition_name
 
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Keeps autogenerate away from the objects the models do not describe:
+    the FTS5 table on SQLite with its shadow tables, the trigram index,
+    which only exists on PostgreSQL, and the monthly partitions of
+    transactions that app.partitions manages.
+    """
+    if type_ == "table" and (name.startswith("transactions_fts") or is_partition_name(name)):
+        return False
+    if type_ == "index" and name == "ix_transactions_user_id_description_trgm":
+        return context.get_context().dialect.name == "postgresql"
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -54,6 +69,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -76,7 +92,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,52 @@
+"""add monthly_category_totals
+
+Revision ID: 5d1e0c7a9f42
+Revises: b2860802e0b4
+Create Date: 2026-10-18 11:04:52.917342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e0c7a9f42'
+down_revision: Union[str, Sequence[str], None] = 'b2860802e0b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'monthly_category_totals',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.String(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'category_id', 'month'),
+    )
+
+    # Backfill from existing transactions.
+    if op.get_bind().dialect.name == 'postgresql':
+        month = "to_char(date, 'YYYY-MM')"
+    else:
+        month = "strftime('%Y-%m', date)"
+    op.execute(
+        sa.text(
+            "INSERT INTO monthly_category_totals "
+            "(user_id, category_id, month, total_amount, transaction_count) "
+            f"SELECT user_id, category_id, {month}, SUM(amount), COUNT(*) "
+            f"FROM transactions GROUP BY user_id, category_id, {month}"
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('monthly_category_totals')
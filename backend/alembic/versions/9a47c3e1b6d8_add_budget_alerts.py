@@ -0,0 +1,53 @@
+"""add budget_alerts
+
+Revision ID: 9a47c3e1b6d8
+Revises: 5d1e0c7a9f42
+Create Date: 2026-10-18 12:37:05.208814
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a47c3e1b6d8'
+down_revision: Union[str, Sequence[str], None] = '5d1e0c7a9f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'budget_alerts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.String(), nullable=False),
+        sa.Column('severity', sa.String(), nullable=False),
+        sa.Column('spent', sa.Float(), nullable=False),
+        sa.Column('limit_amount', sa.Float(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_budget_alerts_id'), 'budget_alerts', ['id'], unique=False)
+    op.create_index(
+        'ix_budget_alerts_user_id_category_id_month',
+        'budget_alerts',
+        ['user_id', 'category_id', 'month'],
+        unique=True,
+    )
+    op.create_index('ix_budget_alerts_month_user_id', 'budget_alerts', ['month', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_budget_alerts_month_user_id', table_name='budget_alerts')
+    op.drop_index('ix_budget_alerts_user_id_category_id_month', table_name='budget_alerts')
+    op.drop_index(op.f('ix_budget_alerts_id'), table_name='budget_alerts')
+    op.drop_table('budget_alerts')
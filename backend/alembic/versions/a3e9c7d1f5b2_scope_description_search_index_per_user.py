@@ -0,0 +1,69 @@
+"""scope the description search index per user
+
+Revision ID: a3e9c7d1f5b2
+Revises: d8c1f5a3b2e6
+Create Date: 2026-10-18 22:14:52.630184
+
+On PostgreSQL, replaces the trigram index on description with one on
+(user_id, description). btree_gin lets user_id sit in the same GIN
+index, so a search for a common term only visits the user's own
+matches instead of every tenant's. Each partition's index is built
+CONCURRENTLY and then attached, so transactions stays writable.
+
+SQLite searches transactions_fts; nothing changes there.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e9c7d1f5b2'
+down_revision: Union[str, Sequence[str], None] = 'd8c1f5a3b2e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DESCRIPTION_INDEX = ('ix_transactions_description_trgm', 'description gin_trgm_ops')
+USER_DESCRIPTION_INDEX = ('ix_transactions_user_id_description_trgm', 'user_id, description gin_trgm_ops')
+
+
+def _create_gin_index(name: str, columns: str) -> None:
+    bind = op.get_bind()
+    partitions = bind.scalars(sa.text(
+        "SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = 'transactions'::regclass"
+    )).all()
+    with op.get_context().autocommit_block():
+        if not partitions:
+            op.execute(sa.text(f"CREATE INDEX CONCURRENTLY {name} ON transactions USING gin ({columns})"))
+            return
+        # Invalid, and so unused, until every partition's index is attached.
+        op.execute(sa.text(f"CREATE INDEX {name} ON ONLY transactions USING gin ({columns})"))
+        for partition in partitions:
+            partition_index = f"{partition}_{name.removeprefix('ix_transactions_')}"
+            op.execute(sa.text(
+                f"CREATE INDEX CONCURRENTLY {partition_index} ON {partition} USING gin ({columns})"
+            ))
+            op.execute(sa.text(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}"))
+
+
+def _replace_index(old: tuple[str, str], new: tuple[str, str]) -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # The new index is in place before the old one goes, so searches
+    # always have one.
+    _create_gin_index(*new)
+    op.drop_index(old[0], table_name='transactions')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
+    _replace_index(DESCRIPTION_INDEX, USER_DESCRIPTION_INDEX)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # btree_gin stays; other indexes may use it.
+    _replace_index(USER_DESCRIPTION_INDEX, DESCRIPTION_INDEX)
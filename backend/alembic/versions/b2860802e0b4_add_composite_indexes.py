@@ -0,0 +1,52 @@
+"""add composite indexes on transactions and budgets
+
+Revision ID: b2860802e0b4
+Revises: ebf1f4401af8
+Create Date: 2026-10-18 09:12:31.482113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2860802e0b4'
+down_revision: Union[str, Sequence[str], None] = 'ebf1f4401af8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transactions_user_id_date', 'transactions', ['user_id', 'date'], unique=False)
+    op.create_index(
+        'ix_transactions_user_id_category_id_date',
+        'transactions',
+        ['user_id', 'category_id', 'date'],
+        unique=False,
+    )
+
+    # update_budget never checked for duplicates, so keep the oldest
+    # budget per (user, category, month) before enforcing uniqueness.
+    op.execute(
+        sa.text(
+            "DELETE FROM budgets WHERE id NOT IN ("
+            "SELECT MIN(id) FROM budgets GROUP BY user_id, category_id, month"
+            ")"
+        )
+    )
+    op.create_index(
+        'ix_budgets_user_id_category_id_month',
+        'budgets',
+        ['user_id', 'category_id', 'month'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_budgets_user_id_category_id_month', table_name='budgets')
+    op.drop_index('ix_transactions_user_id_category_id_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_id_date', table_name='transactions')
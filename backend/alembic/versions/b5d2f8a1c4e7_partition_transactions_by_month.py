@@ -0,0 +1,119 @@
+"""partition transactions by month
+
+Revision ID: b5d2f8a1c4e7
+Revises: f2a6c8e4b190
+Create Date: 2026-10-18 19:42:05.118934
+
+On PostgreSQL, rebuilds transactions as a table range-partitioned on
+date: one partition per month that has rows, the current month and the
+next PARTITION_MONTHS_AHEAD, plus transactions_default for everything
+else. A partitioned table's primary key has to include the partition
+key, so it becomes (id, date). The rows are copied across while writes
+wait, so on a large table run this in a maintenance window. Afterwards
+app.partitions keeps future months created and archives old ones.
+
+SQLite keeps its ordinary table; nothing changes there.
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d2f8a1c4e7'
+down_revision: Union[str, Sequence[str], None] = 'f2a6c8e4b190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as the default of settings.PARTITION_MONTHS_AHEAD.
+PARTITION_MONTHS_AHEAD = 3
+
+COLUMNS = 'id, description, date, category_id, user_id, amount_cents'
+
+
+def _create_table(name: str, partitioned: bool) -> None:
+    # The id sequence outlives both tables; see _swap_in.
+    op.execute(sa.text(
+        f"CREATE TABLE {name} ("
+        "id INTEGER NOT NULL DEFAULT nextval('transactions_id_seq'), "
+        "description VARCHAR, "
+        "date DATE NOT NULL, "
+        "category_id INTEGER NOT NULL, "
+        "user_id INTEGER NOT NULL, "
+        "amount_cents BIGINT NOT NULL"
+        f"){' PARTITION BY RANGE (date)' if partitioned else ''}"
+    ))
+
+
+def _swap_in(name: str, primary_key: list[str]) -> None:
+    """Copies transactions into `name`, replaces it, and rebuilds keys and indexes."""
+    op.execute(sa.text(f"INSERT INTO {name} ({COLUMNS}) SELECT {COLUMNS} FROM transactions"))
+    op.execute(sa.text("ALTER SEQUENCE transactions_id_seq OWNED BY NONE"))
+    op.drop_table('transactions')
+    op.rename_table(name, 'transactions')
+    op.execute(sa.text("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id"))
+
+    op.create_primary_key('transactions_pkey', 'transactions', primary_key)
+    op.create_foreign_key(
+        'transactions_category_id_fkey', 'transactions', 'categories', ['category_id'], ['id'], ondelete='CASCADE',
+    )
+    op.create_foreign_key(
+        'transactions_user_id_fkey', 'transactions', 'users', ['user_id'], ['id'], ondelete='CASCADE',
+    )
+    op.create_index('ix_transactions_id', 'transactions', ['id'], unique=False)
+    op.create_index('ix_transactions_user_id_date', 'transactions', ['user_id', 'date'], unique=False)
+    op.create_index(
+        'ix_transactions_user_id_category_id_date', 'transactions', ['user_id', 'category_id', 'date'], unique=False,
+    )
+    op.create_index('ix_transactions_category_id', 'transactions', ['category_id'], unique=False)
+    op.create_index(
+        'ix_transactions_description_trgm',
+        'transactions',
+        ['description'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'},
+    )
+    op.execute(sa.text("ANALYZE transactions"))
+
+
+def _month_start(year: int, month: int) -> date:
+    year, month = divmod(year * 12 + month - 1, 12)
+    return date(year, month + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # Reads carry on during the copy; writes wait for it.
+    op.execute(sa.text("LOCK TABLE transactions IN EXCLUSIVE MODE"))
+    _create_table('transactions_partitioned', partitioned=True)
+    op.execute(sa.text("CREATE TABLE transactions_default PARTITION OF transactions_partitioned DEFAULT"))
+
+    months = set(bind.scalars(sa.text("SELECT DISTINCT date_trunc('month', date)::date FROM transactions")))
+    today = date.today()
+    months.update(_month_start(today.year, today.month + ahead) for ahead in range(PARTITION_MONTHS_AHEAD + 1))
+    for start in sorted(months):
+        end = _month_start(start.year, start.month + 1)
+        op.execute(sa.text(
+            f"CREATE TABLE transactions_{start.year:04d}_{start.month:02d} "
+            f"PARTITION OF transactions_partitioned FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+
+    _swap_in('transactions_partitioned', ['id', 'date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Only attached partitions come back; archived ones stay as they are.
+    op.execute(sa.text("LOCK TABLE transactions IN EXCLUSIVE MODE"))
+    _create_table('transactions_unpartitioned', partitioned=False)
+    _swap_in('transactions_unpartitioned', ['id'])
@@ -0,0 +1,115 @@
+"""store money as integer cents
+
+Revision ID: c3f8a2d5e71b
+Revises: 9a47c3e1b6d8
+Create Date: 2026-10-18 14:22:48.615077
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a2d5e71b'
+down_revision: Union[str, Sequence[str], None] = '9a47c3e1b6d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows updated per statement, so the backfill never holds long locks.
+BACKFILL_BATCH_SIZE = 10000
+
+
+def _to_cents(column: str) -> str:
+    # NUMERIC rounding is half away from zero, like app.utils.to_cents;
+    # rounding a float in Postgres would round half to even.
+    if op.get_bind().dialect.name == 'postgresql':
+        return f"ROUND(CAST({column} AS NUMERIC) * 100)"
+    return f"ROUND({column} * 100)"
+
+
+def _backfill(table: str, assignment: str) -> None:
+    """Runs `UPDATE table SET assignment` in id ranges, committing each one."""
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        max_id = bind.execute(sa.text(f"SELECT MAX(id) FROM {table}")).scalar() or 0
+        for low in range(0, max_id, BACKFILL_BATCH_SIZE):
+            bind.execute(
+                sa.text(f"UPDATE {table} SET {assignment} WHERE id > :low AND id <= :high"),
+                {"low": low, "high": low + BACKFILL_BATCH_SIZE},
+            )
+
+
+def _month(column: str) -> str:
+    if op.get_bind().dialect.name == 'postgresql':
+        return f"to_char({column}, 'YYYY-MM')"
+    return f"strftime('%Y-%m', {column})"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transactions', sa.Column('amount_cents', sa.BigInteger(), nullable=True))
+    op.add_column('budgets', sa.Column('limit_cents', sa.BigInteger(), nullable=True))
+
+    _backfill('transactions', f"amount_cents = {_to_cents('amount')}")
+    _backfill('budgets', f"limit_cents = {_to_cents('limit_amount')}")
+
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.alter_column('amount_cents', existing_type=sa.BigInteger(), nullable=False)
+        batch_op.drop_column('amount')
+    with op.batch_alter_table('budgets') as batch_op:
+        batch_op.alter_column('limit_cents', existing_type=sa.BigInteger(), nullable=False)
+        batch_op.drop_column('limit_amount')
+
+    # Totals are recomputed exactly from the converted transactions rather
+    # than converting the float sums.
+    with op.batch_alter_table('monthly_category_totals') as batch_op:
+        batch_op.drop_column('total_amount')
+        batch_op.add_column(sa.Column('total_cents', sa.BigInteger(), nullable=False, server_default='0'))
+    op.execute(sa.text("DELETE FROM monthly_category_totals"))
+    op.execute(
+        sa.text(
+            "INSERT INTO monthly_category_totals "
+            "(user_id, category_id, month, total_cents, transaction_count) "
+            f"SELECT user_id, category_id, {_month('date')}, SUM(amount_cents), COUNT(*) "
+            f"FROM transactions GROUP BY user_id, category_id, {_month('date')}"
+        )
+    )
+
+    # Alerts are derived data; the next scan recreates them.
+    op.execute(sa.text("DELETE FROM budget_alerts"))
+    with op.batch_alter_table('budget_alerts') as batch_op:
+        batch_op.drop_column('spent')
+        batch_op.drop_column('limit_amount')
+        batch_op.add_column(sa.Column('spent_cents', sa.BigInteger(), nullable=False))
+        batch_op.add_column(sa.Column('limit_cents', sa.BigInteger(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("DELETE FROM budget_alerts"))
+    with op.batch_alter_table('budget_alerts') as batch_op:
+        batch_op.drop_column('limit_cents')
+        batch_op.drop_column('spent_cents')
+        batch_op.add_column(sa.Column('spent', sa.Float(), nullable=False))
+        batch_op.add_column(sa.Column('limit_amount', sa.Float(), nullable=False))
+
+    with op.batch_alter_table('monthly_category_totals') as batch_op:
+        batch_op.add_column(sa.Column('total_amount', sa.Float(), nullable=False, server_default='0'))
+    op.execute(sa.text("UPDATE monthly_category_totals SET total_amount = total_cents / 100.0"))
+    with op.batch_alter_table('monthly_category_totals') as batch_op:
+        batch_op.drop_column('total_cents')
+
+    op.add_column('transactions', sa.Column('amount', sa.Float(), nullable=True))
+    op.add_column('budgets', sa.Column('limit_amount', sa.Float(), nullable=True))
+
+    _backfill('transactions', "amount = amount_cents / 100.0")
+    _backfill('budgets', "limit_amount = limit_cents / 100.0")
+
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.alter_column('amount', existing_type=sa.Float(), nullable=False)
+        batch_op.drop_column('amount_cents')
+    with op.batch_alter_table('budgets') as batch_op:
+        batch_op.alter_column('limit_amount', existing_type=sa.Float(), nullable=False)
+        batch_op.drop_column('limit_cents')
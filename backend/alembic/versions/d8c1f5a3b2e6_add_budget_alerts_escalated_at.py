@@ -0,0 +1,33 @@
+"""add budget_alerts.escalated_at
+
+Revision ID: d8c1f5a3b2e6
+Revises: b5d2f8a1c4e7
+Create Date: 2026-10-18 21:06:33.402517
+
+Existing alerts count as escalated when they were created.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8c1f5a3b2e6'
+down_revision: Union[str, Sequence[str], None] = 'b5d2f8a1c4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('budget_alerts', sa.Column('escalated_at', sa.DateTime(), nullable=True))
+    op.execute(sa.text("UPDATE budget_alerts SET escalated_at = created_at"))
+    with op.batch_alter_table('budget_alerts') as batch_op:
+        batch_op.alter_column('escalated_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('budget_alerts') as batch_op:
+        batch_op.drop_column('escalated_at')
@@ -0,0 +1,72 @@
+"""add transaction description search
+
+Revision ID: e7d4b9a1c3f6
+Revises: c3f8a2d5e71b
+Create Date: 2026-10-18 17:05:12.904316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7d4b9a1c3f6'
+down_revision: Union[str, Sequence[str], None] = 'c3f8a2d5e71b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as app.models.TRANSACTIONS_FTS_DDL at the time of this revision.
+TRANSACTIONS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+    "description, content='transactions', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE OF description ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        # CONCURRENTLY keeps transactions writable while the index builds.
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_transactions_description_trgm',
+                'transactions',
+                ['description'],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={'description': 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+        return
+
+    for statement in TRANSACTIONS_FTS_DDL:
+        op.execute(sa.text(statement))
+    # Index the existing rows.
+    op.execute(sa.text("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                'ix_transactions_description_trgm',
+                table_name='transactions',
+                postgresql_concurrently=True,
+            )
+        return
+
+    for trigger in ('transactions_fts_insert', 'transactions_fts_delete', 'transactions_fts_update'):
+        op.execute(sa.text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    op.execute(sa.text("DROP TABLE IF EXISTS transactions_fts"))
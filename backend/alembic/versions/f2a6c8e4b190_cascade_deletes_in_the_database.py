@@ -0,0 +1,113 @@
+"""cascade deletes in the database
+
+Revision ID: f2a6c8e4b190
+Revises: e7d4b9a1c3f6
+Create Date: 2026-10-18 18:31:47.270553
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6c8e4b190'
+down_revision: Union[str, Sequence[str], None] = 'e7d4b9a1c3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> [(column, referred table)]
+FOREIGN_KEYS = {
+    'categories': [('user_id', 'users')],
+    'transactions': [('category_id', 'categories'), ('user_id', 'users')],
+    'budgets': [('category_id', 'categories'), ('user_id', 'users')],
+    'monthly_category_totals': [('category_id', 'categories'), ('user_id', 'users')],
+    'budget_alerts': [('category_id', 'categories'), ('user_id', 'users')],
+}
+
+# Without an index on the referencing column, every cascaded delete
+# would scan the whole child table.
+INDEXES = [
+    ('ix_categories_user_id', 'categories', 'user_id'),
+    ('ix_transactions_category_id', 'transactions', 'category_id'),
+    ('ix_budgets_category_id', 'budgets', 'category_id'),
+    ('ix_monthly_category_totals_category_id', 'monthly_category_totals', 'category_id'),
+    ('ix_budget_alerts_category_id', 'budget_alerts', 'category_id'),
+]
+
+# SQLite foreign keys can only change by recreating the table, and the
+# original constraints are unnamed.
+SQLITE_NAMING = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+# Recreating transactions on SQLite drops the search triggers from
+# e7d4b9a1c3f6; same statements as that revision.
+TRANSACTIONS_FTS_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE OF description ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END",
+)
+
+
+def _replace_postgresql_foreign_keys(ondelete: str | None) -> None:
+    for table, foreign_keys in FOREIGN_KEYS.items():
+        for column, referred in foreign_keys:
+            name = f'{table}_{column}_fkey'
+            op.drop_constraint(name, table, type_='foreignkey')
+            # NOT VALID skips checking existing rows under the heavier lock.
+            op.create_foreign_key(
+                name, table, referred, [column], ['id'], ondelete=ondelete, postgresql_not_valid=True,
+            )
+    # Validating takes a lock that does not block reads or writes.
+    with op.get_context().autocommit_block():
+        for table, foreign_keys in FOREIGN_KEYS.items():
+            for column, _ in foreign_keys:
+                op.execute(sa.text(f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey'))
+
+
+def _replace_sqlite_foreign_keys(ondelete: str | None, with_indexes: bool) -> None:
+    indexes = {table: (name, column) for name, table, column in INDEXES}
+    for table, foreign_keys in FOREIGN_KEYS.items():
+        with op.batch_alter_table(table, recreate='always', naming_convention=SQLITE_NAMING) as batch_op:
+            for column, referred in foreign_keys:
+                name = f'fk_{table}_{column}_{referred}'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, referred, [column], ['id'], ondelete=ondelete)
+            name, column = indexes[table]
+            if with_indexes:
+                batch_op.create_index(name, [column], unique=False)
+            else:
+                batch_op.drop_index(name)
+    for statement in TRANSACTIONS_FTS_TRIGGERS:
+        op.execute(sa.text(statement))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        _replace_sqlite_foreign_keys('CASCADE', with_indexes=True)
+        return
+
+    # Indexes first, so no cascade ever runs without one.
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(name, table, [column], unique=False, postgresql_concurrently=True)
+    _replace_postgresql_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        _replace_sqlite_foreign_keys(None, with_indexes=False)
+        return
+
+    _replace_postgresql_foreign_keys(None)
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
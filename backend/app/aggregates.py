@@ -0,0 +1,205 @@
+"""
+Maintains monthly_category_totals, the per user/category/month running
+sum and count of transactions that the summary endpoints read instead
+of scanning transactions.
+
+Every code path that writes transactions must apply the matching deltas
+in the same database transaction. To recompute the table from scratch
+or check it for drift:
+
+    python -m app.aggregates verify [--user-id N]
+    python -m app.aggregates rebuild [--user-id N]
+"""
+import argparse
+import sys
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import and_, delete, func, insert, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import SessionLocal, dialect_insert
+from app.utils import month_of
+
+
+class TotalsDelta:
+    """Accumulates changes to monthly totals before they are written."""
+
+    def __init__(self):
+        self._changes: dict[tuple[int, str], list[int]] = defaultdict(lambda: [0, 0])
+
+    def add(self, category_id: int, on: date, amount_cents: int):
+        change = self._changes[(category_id, month_of(on))]
+        change[0] += amount_cents
+        change[1] += 1
+
+    def remove(self, category_id: int, on: date, amount_cents: int):
+        change = self._changes[(category_id, month_of(on))]
+        change[0] -= amount_cents
+        change[1] -= 1
+
+    def rows(self, user_id: int) -> list[dict]:
+        return [
+            {
+                "user_id": user_id,
+                "category_id": category_id,
+                "month": month,
+                "total_cents": total,
+                "transaction_count": count,
+            }
+            for (category_id, month), (total, count) in self._changes.items()
+            if count or total
+        ]
+
+
+def _upsert_statement(dialect_name: str):
+    table = models.MonthlyCategoryTotal.__table__
+    statement = dialect_insert(dialect_name, table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.category_id, table.c.month],
+        set_={
+            "total_cents": table.c.total_cents + statement.excluded.total_cents,
+            "transaction_count": table.c.transaction_count + statement.excluded.transaction_count,
+        },
+    )
+
+
+async def apply_totals_delta(db: AsyncSession, user_id: int, delta: TotalsDelta):
+    """Upserts the accumulated changes in one statement. Does not commit."""
+    rows = delta.rows(user_id)
+    if not rows:
+        return
+    await db.execute(_upsert_statement(db.get_bind().dialect.name), rows)
+
+
+def month_expression(dialect_name: str, column):
+    """SQL for the "YYYY-MM" month of a date column."""
+    if dialect_name == "postgresql":
+        return func.to_char(column, literal_column("'YYYY-MM'"))
+    return func.strftime("%Y-%m", column)
+
+
+def _expected_totals(dialect_name: str, user_id: int | None):
+    month = month_expression(dialect_name, models.Transaction.date)
+    query = select(
+        models.Transaction.user_id.label("user_id"),
+        models.Transaction.category_id.label("category_id"),
+        month.label("month"),
+        func.sum(models.Transaction.amount_cents).label("total_cents"),
+        func.count().label("transaction_count"),
+    ).group_by(models.Transaction.user_id, models.Transaction.category_id, month)
+    if user_id is not None:
+        query = query.where(models.Transaction.user_id == user_id)
+    return query
+
+
+def rebuild_totals(db: Session, user_id: int | None = None) -> int:
+    """Recomputes the table from transactions. Returns the rows written."""
+    dialect_name = db.get_bind().dialect.name
+    table = models.MonthlyCategoryTotal.__table__
+
+    clear = delete(table)
+    if user_id is not None:
+        clear = clear.where(table.c.user_id == user_id)
+    db.execute(clear)
+
+    expected = _expected_totals(dialect_name, user_id)
+    result = db.execute(
+        insert(table).from_select(
+            ["user_id", "category_id", "month", "total_cents", "transaction_count"],
+            expected,
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def verify_totals(db: Session, user_id: int | None = None) -> list[dict]:
+    """
+    Compares the table against a fresh aggregation of transactions.
+    Returns one entry per (user, category, month) that disagrees.
+    """
+    dialect_name = db.get_bind().dialect.name
+    expected = _expected_totals(dialect_name, user_id).subquery()
+    actual = models.MonthlyCategoryTotal
+
+    drift = []
+
+    # Months with transactions whose stored totals are missing or wrong.
+    rows = db.execute(
+        select(
+            expected,
+            actual.total_cents.label("stored_total"),
+            actual.transaction_count.label("stored_count"),
+        ).outerjoin(actual, and_(
+            actual.user_id == expected.c.user_id,
+            actual.category_id == expected.c.category_id,
+            actual.month == expected.c.month,
+        ))
+    )
+    for row in rows:
+        stored_total = row.stored_total or 0
+        stored_count = row.stored_count or 0
+        if stored_count != row.transaction_count or stored_total != row.total_cents:
+            drift.append({
+                "user_id": row.user_id,
+                "category_id": row.category_id,
+                "month": row.month,
+                "expected_total": row.total_cents,
+                "expected_count": row.transaction_count,
+                "stored_total": stored_total,
+                "stored_count": stored_count,
+            })
+
+    # Stored totals for months that no longer have any transactions.
+    orphans = select(actual).outerjoin(expected, and_(
+        actual.user_id == expected.c.user_id,
+        actual.category_id == expected.c.category_id,
+        actual.month == expected.c.month,
+    )).where(
+        expected.c.user_id.is_(None),
+        (actual.transaction_count != 0) | (actual.total_cents != 0),
+    )
+    if user_id is not None:
+        orphans = orphans.where(actual.user_id == user_id)
+    for total in db.scalars(orphans):
+        drift.append({
+            "user_id": total.user_id,
+            "category_id": total.category_id,
+            "month": total.month,
+            "expected_total": 0,
+            "expected_count": 0,
+            "stored_total": total.total_cents,
+            "stored_count": total.transaction_count,
+        })
+
+    return drift
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.aggregates", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--user-id", type=int, default=None, help="only this user")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        if args.command == "rebuild":
+            written = rebuild_totals(db, args.user_id)
+            print(f"Rebuilt monthly_category_totals: {written} rows")
+            return 0
+
+        drift = verify_totals(db, args.user_id)
+        for entry in drift:
+            print(
+                "drift user={user_id} category={category_id} month={month} "
+                "expected={expected_total}/{expected_count} "
+                "stored={stored_total}/{stored_count}".format(**entry)
+            )
+        print(f"{len(drift)} drifted rows")
+        return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
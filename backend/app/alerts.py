@@ -0,0 +1,164 @@
+"""
+Background scanner that records budget alerts for every user, so they
+can be pushed or fetched without rebuilding anyone's summary:
+
+    python -m app.alerts scan [--month YYYY-MM] [--batch-size N]
+
+Users with budgets in the month are walked in id order, a batch at a
+time. Each batch is one INSERT ... SELECT over budgets joined to
+monthly_category_totals, so memory stays bounded by the batch size.
+"""
+import argparse
+import sys
+from datetime import date, datetime
+
+from sqlalchemy import DateTime, and_, case, delete, func, literal, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import SessionLocal, dialect_insert
+from app.utils import month_of, month_range
+
+SCAN_BATCH_SIZE = 1000
+
+
+def _alerts_for_users(month: str, first_user_id: int, last_user_id: int, scanned_at: datetime):
+    """Every expense budget at or past its warning threshold for these users."""
+    spent = func.coalesce(models.MonthlyCategoryTotal.total_cents, 0)
+    return (
+        select(
+            models.Budget.user_id,
+            models.Budget.category_id,
+            models.Budget.month,
+            case((spent >= models.Budget.limit_cents, "high"), else_="warning"),
+            spent,
+            models.Budget.limit_cents,
+            literal(scanned_at, DateTime),
+            literal(scanned_at, DateTime),
+            literal(scanned_at, DateTime),
+        )
+        .join(models.Category, and_(
+            models.Category.id == models.Budget.category_id,
+            models.Category.type == "expense",
+        ))
+        .outerjoin(models.MonthlyCategoryTotal, and_(
+            models.MonthlyCategoryTotal.user_id == models.Budget.user_id,
+            models.MonthlyCategoryTotal.category_id == models.Budget.category_id,
+            models.MonthlyCategoryTotal.month == models.Budget.month,
+        ))
+        .where(
+            models.Budget.month == month,
+            models.Budget.user_id.between(first_user_id, last_user_id),
+            models.Budget.limit_cents > 0,
+            # At least 80%, the same threshold as the per-request alerts,
+            # kept in integers.
+            spent * 5 >= models.Budget.limit_cents * 4,
+        )
+    )
+
+
+def _upsert_alerts(dialect_name: str, alerts):
+    table = models.BudgetAlert.__table__
+    statement = dialect_insert(dialect_name, table).from_select(
+        [
+            "user_id", "category_id", "month", "severity", "spent_cents", "limit_cents",
+            "created_at", "escalated_at", "updated_at",
+        ],
+        alerts,
+    )
+    # created_at keeps the first time the threshold was crossed, and
+    # escalated_at moves on only when a warning becomes high.
+    escalated = and_(table.c.severity != "high", statement.excluded.severity == "high")
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.category_id, table.c.month],
+        set_={
+            "severity": statement.excluded.severity,
+            "spent_cents": statement.excluded.spent_cents,
+            "limit_cents": statement.excluded.limit_cents,
+            "escalated_at": case((escalated, statement.excluded.escalated_at), else_=table.c.escalated_at),
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+
+
+def scan_alerts(db: Session, month: str, batch_size: int = SCAN_BATCH_SIZE) -> dict:
+    """
+    Brings budget_alerts up to date for one month: upserts an alert for
+    every budget at or past its threshold and removes alerts that no
+    longer apply. Commits after each batch of users. Alerts that went
+    from warning to high count as escalated rather than new.
+    """
+    dialect_name = db.get_bind().dialect.name
+    scanned_at = datetime.utcnow()
+    users = 0
+    last_user_id = 0
+
+    while True:
+        user_ids = db.scalars(
+            select(models.Budget.user_id)
+            .where(models.Budget.month == month, models.Budget.user_id > last_user_id)
+            .distinct()
+            .order_by(models.Budget.user_id)
+            .limit(batch_size)
+        ).all()
+        if not user_ids:
+            break
+
+        db.execute(_upsert_alerts(
+            dialect_name,
+            _alerts_for_users(month, user_ids[0], user_ids[-1], scanned_at),
+        ))
+        db.commit()
+        users += len(user_ids)
+        last_user_id = user_ids[-1]
+
+    # Anything this scan did not touch has dropped below its threshold.
+    removed = db.execute(
+        delete(models.BudgetAlert).where(
+            models.BudgetAlert.month == month,
+            models.BudgetAlert.updated_at < scanned_at,
+        )
+    ).rowcount
+    db.commit()
+
+    new, escalated = db.execute(
+        select(
+            func.count().filter(models.BudgetAlert.created_at == scanned_at),
+            func.count().filter(models.BudgetAlert.created_at < scanned_at),
+        ).where(
+            models.BudgetAlert.month == month,
+            models.BudgetAlert.escalated_at == scanned_at,
+        )
+    ).one()
+    return {
+        "month": month,
+        "users": users,
+        "new_alerts": new,
+        "escalated_alerts": escalated,
+        "removed_alerts": removed,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.alerts", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=["scan"])
+    parser.add_argument("--month", default=month_of(date.today()), help="YYYY-MM, defaults to the current month")
+    parser.add_argument("--batch-size", type=int, default=SCAN_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    try:
+        start, _ = month_range(args.month)
+    except ValueError:
+        parser.error("month must be in format YYYY-MM (e.g. 2026-02)")
+
+    with SessionLocal() as db:
+        result = scan_alerts(db, month_of(start), args.batch_size)
+    print(
+        "Scanned {users} users for {month}: "
+        "{new_alerts} new alerts, {escalated_alerts} escalated, {removed_alerts} removed".format(**result)
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,31 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 import bcrypt
 
 from app.config import settings
+from app.metrics import password_hash_duration, password_hash_rejections, password_hash_wait
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing pool has no room for more work."""
+
+
+# bcrypt releases the GIL while hashing, so a small dedicated thread pool
+# runs hashes in parallel without borrowing the shared request threadpool.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.BCRYPT_POOL_SIZE,
+    thread_name_prefix="bcrypt",
+)
+# Hashes running or waiting for a thread. Only touched on the event loop.
+_hash_jobs = 0
 
 
 def hash_password(password: str) -> str:
     password_bytes = password.encode("utf-8")
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS))
     return hashed.decode("utf-8")
 
 
@@ -18,6 +36,49 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a different cost than BCRYPT_ROUNDS."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+def _timed_hash(operation: str, submitted_at: float, func, *args):
+    """Runs on a hashing thread, recording its queue wait and bcrypt time."""
+    started = time.perf_counter()
+    password_hash_wait.labels(operation).observe(started - submitted_at)
+    try:
+        return func(*args)
+    finally:
+        password_hash_duration.labels(operation).observe(time.perf_counter() - started)
+
+
+async def _run_in_hash_pool(operation: str, func, *args):
+    global _hash_jobs
+    if _hash_jobs >= settings.BCRYPT_POOL_SIZE + settings.BCRYPT_MAX_QUEUE:
+        password_hash_rejections.inc()
+        raise PasswordHasherBusy()
+    _hash_jobs += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _hash_executor, _timed_hash, operation, time.perf_counter(), func, *args,
+        )
+    finally:
+        _hash_jobs -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the hashing pool. Raises PasswordHasherBusy when full."""
+    return await _run_in_hash_pool("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing pool. Raises PasswordHasherBusy when full."""
+    return await _run_in_hash_pool("verify", verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
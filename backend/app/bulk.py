@@ -0,0 +1,146 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import IO, AsyncIterator, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+
+IMPORT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+
+TRANSACTION_COLUMNS = ("amount_cents", "description", "date", "category_id", "user_id")
+EXPORT_COLUMNS = ("id", "amount", "description", "date", "category_id")
+
+
+def detect_import_format(filename: str | None, content_type: str | None) -> str | None:
+    """
+    Guesses the upload format from the file name or content type.
+    Returns "csv", "ndjson", or None if it can't tell.
+    """
+    name = (filename or "").lower()
+    ctype = (content_type or "").lower()
+    if name.endswith(".csv") or "csv" in ctype:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in ctype or "jsonl" in ctype:
+        return "ndjson"
+    return None
+
+
+def _iter_raw_rows(file: IO[bytes], fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """
+    Yields (row_number, raw_row, parse_error) one line at a time,
+    so the upload is never held in memory as a whole.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(text), start=1):
+            yield row_number, row, None
+        return
+
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row_number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Each line must be a JSON object"
+            continue
+        yield row_number, row, None
+
+
+def iter_import_rows(
+    file: IO[bytes], fmt: str
+) -> Iterator[tuple[int, schemas.TransactionCreate | None, str | None]]:
+    """
+    Parses and validates each row of a CSV or NDJSON upload.
+    Yields (row_number, transaction, error) — exactly one of
+    transaction and error is set.
+    """
+    for row_number, raw, error in _iter_raw_rows(file, fmt):
+        if error:
+            yield row_number, None, error
+            continue
+        if raw.get("description") == "":
+            raw["description"] = None
+        try:
+            yield row_number, schemas.TransactionCreate.model_validate(raw), None
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            field = ".".join(str(part) for part in first["loc"])
+            yield row_number, None, f"{field}: {first['msg']}" if field else first["msg"]
+
+
+def next_import_batch(
+    rows: Iterator[tuple[int, schemas.TransactionCreate | None, str | None]],
+    size: int = IMPORT_BATCH_SIZE,
+) -> list[tuple[int, schemas.TransactionCreate | None, str | None]]:
+    """Pulls up to `size` parsed rows from iter_import_rows. Blocking."""
+    return list(islice(rows, size))
+
+
+async def _copy_transactions(db: AsyncSession, rows: list[dict]):
+    """Streams a batch into Postgres with COPY, the fastest bulk path."""
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "transactions",
+        records=[tuple(row[column] for column in TRANSACTION_COLUMNS) for row in rows],
+        columns=TRANSACTION_COLUMNS,
+    )
+
+
+async def insert_transactions(db: AsyncSession, rows: list[dict]):
+    """
+    Inserts a batch of transaction rows in one round trip.
+    Uses COPY on PostgreSQL and an executemany INSERT elsewhere.
+    Does not commit.
+    """
+    if not rows:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        await _copy_transactions(db, rows)
+    else:
+        await db.execute(insert(models.Transaction), rows)
+
+
+async def iter_export_csv(rows: AsyncIterator) -> AsyncIterator[str]:
+    """
+    Serializes (id, amount, description, date, category_id) rows as CSV,
+    yielding one chunk per EXPORT_BATCH_SIZE rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    async for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+async def iter_export_ndjson(rows: AsyncIterator) -> AsyncIterator[str]:
+    """Same as iter_export_csv, but one JSON object per line."""
+    chunk = []
+    async for row in rows:
+        record = dict(zip(EXPORT_COLUMNS, row))
+        record["date"] = record["date"].isoformat()
+        chunk.append(json.dumps(record))
+        if len(chunk) == EXPORT_BATCH_SIZE:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
@@ -1,23 +1,170 @@
+import asyncio
 import json
-import redis
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import redis.asyncio as redis
 from app.config import settings
+from app.instrumentation import record_redis_call
+from app.metrics import Counter, cache_invalidations, cache_requests
 
-try:
-    redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-    redis_client.ping()
-    REDIS_AVAILABLE = True
-except (redis.ConnectionError, redis.RedisError):
-    redis_client = None
-    REDIS_AVAILABLE = False
+redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+REDIS_AVAILABLE = False
 
 DEFAULT_TTL = 300
 
+# Version keys outlive any entry built under them, so an expired version
+# key can never make a stale entry reachable again.
+SUMMARY_VERSION_TTL = 7 * 24 * 3600
+SUMMARY_GENERATION_KEY = "summary_generation"
+# Bumped whenever the cached summary payload changes shape, so entries
+# written by older code are never read. 2: amounts in integer cents.
+# 3: entries carry their ETag.
+SUMMARY_FORMAT = 3
+
+# Workers tell each other which entries to drop from their local caches.
+INVALIDATION_CHANNEL = "cache_invalidations"
+WORKER_ID = uuid.uuid4().hex
+
+# Seconds between attempts to reach Redis again while it is down.
+REDIS_RETRY_INTERVAL = 1
+
+
+class LocalCache:
+    """
+    A bounded in-process cache. Entries expire after `ttl` seconds, and
+    once `max_entries` is reached the least recently used one is evicted.
+    `scope` maps a key to the group it is invalidated with, such as its
+    user. Not thread-safe: it is only touched from the event loop.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, scope=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._scope = scope or (lambda key: key)
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        # Ticks on every invalidation. Each scope records the tick it was
+        # last invalidated at, so a reader can tell whether the value it
+        # just built for a key may already be stale.
+        self.generation = 0
+        self._invalidated: OrderedDict[Any, int] = OrderedDict()
+        # Scopes whose record has been dropped to bound memory count as
+        # invalidated at this tick.
+        self._forgotten = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidated_since(self, key, generation: int) -> bool:
+        """True if the key's scope was invalidated after `generation` was read."""
+        return self._invalidated.get(self._scope(key), self._forgotten) > generation
+
+    def _invalidate(self, scope):
+        self.generation += 1
+        self._invalidated[scope] = self.generation
+        self._invalidated.move_to_end(scope)
+        while len(self._invalidated) > max(self.max_entries, 1):
+            _, self._forgotten = self._invalidated.popitem(last=False)
+
+    def delete(self, key):
+        self._invalidate(self._scope(key))
+        self._entries.pop(key, None)
+
+    def delete_scope(self, scope):
+        self._invalidate(scope)
+        for key in [key for key in self._entries if self._scope(key) == scope]:
+            del self._entries[key]
+
+    def clear(self):
+        self.generation += 1
+        self._invalidated.clear()
+        self._forgotten = self.generation
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Monthly summaries, keyed by (user id, month) and invalidated per user.
+local_cache = LocalCache(settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_TTL, scope=lambda key: key[0])
+
+# Authenticated users, keyed by user id, so most requests skip the users table.
+principal_cache = LocalCache(settings.PRINCIPAL_CACHE_MAX_ENTRIES, settings.PRINCIPAL_CACHE_TTL)
+
+cache_stats = {
+    tier: {
+        "hits": Counter(mirror=cache_requests.labels(tier=tier, result="hit")),
+        "misses": Counter(mirror=cache_requests.labels(tier=tier, result="miss")),
+    }
+    for tier in ("l1", "l2")
+}
+
+_listener_task: asyncio.Task | None = None
+
+
+async def _timed(call):
+    """Awaits a Redis call, counting it against the current request."""
+    started = time.perf_counter()
+    try:
+        return await call
+    finally:
+        record_redis_call(time.perf_counter() - started)
+
+
+async def init_cache():
+    """
+    Checks that Redis is reachable and starts listening for invalidations
+    from other workers. Called once at app startup. Without Redis the
+    local cache still works on its own, and the listener keeps retrying
+    until Redis is back.
+    """
+    global REDIS_AVAILABLE, _listener_task
+    local_cache.clear()
+    principal_cache.clear()
+    try:
+        await redis_client.ping()
+        REDIS_AVAILABLE = True
+    except (redis.ConnectionError, redis.RedisError):
+        REDIS_AVAILABLE = False
+    _listener_task = asyncio.create_task(_listen_for_invalidations())
+
+
+async def close_cache():
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+    await redis_client.aclose()
+
 
-def get_cache(key: str):
+async def get_cache(key: str):
     if not REDIS_AVAILABLE:
         return None
     try:
-        data = redis_client.get(key)
+        data = await _timed(redis_client.get(key))
         if data:
             return json.loads(data)
         return None
@@ -25,21 +172,279 @@ def get_cache(key: str):
         return None
 
 
-def set_cache(key: str, value: dict, ttl: int = DEFAULT_TTL):
+async def set_cache(key: str, value: dict, ttl: int = DEFAULT_TTL):
+    if not REDIS_AVAILABLE:
+        return
+    try:
+        await _timed(redis_client.setex(key, ttl, json.dumps(value)))
+    except redis.RedisError:
+        pass
+
+
+def _summary_version_key(user_id: int, month: str | None = None) -> str:
+    if month is None:
+        return f"summary_version:{user_id}"
+    return f"summary_version:{user_id}:{month}"
+
+
+def _summary_key(user_id: int, user_version, month: str, month_version) -> str:
+    """
+    The Redis key for a user's monthly summary. It embeds the user's
+    version and the month's version, so bumping either makes older
+    entries unreachable; those simply expire with their TTL.
+    """
+    return f"summary:{user_id}:v{user_version or 0}:{month}:v{month_version or 0}:f{SUMMARY_FORMAT}"
+
+
+@dataclass
+class SummaryLookup:
+    user_id: int
+    month: str
+    value: dict | None
+    redis_key: str | None
+    local_generation: int
+
+
+async def lookup_summary(user_id: int, month: str) -> SummaryLookup:
+    """
+    Looks a monthly summary up in the local cache, then in Redis.
+    Pass the result to store_summary after building a missing summary.
+    """
+    return (await lookup_summaries(user_id, [month]))[0]
+
+
+async def lookup_summaries(user_id: int, months: list[str]) -> list[SummaryLookup]:
+    """
+    Looks several months up at once. Months missing locally cost two
+    Redis round trips in total: one MGET for their versions and one
+    for the entries themselves.
+    """
+    generation = local_cache.generation
+    lookups = []
+    missing = []
+    for month in months:
+        value = local_cache.get((user_id, month))
+        if value is not None:
+            cache_stats["l1"]["hits"].inc()
+        else:
+            cache_stats["l1"]["misses"].inc()
+            missing.append(month)
+        lookups.append(SummaryLookup(user_id, month, value, None, generation))
+
+    if not missing or not REDIS_AVAILABLE:
+        return lookups
+
+    try:
+        user_version, *month_versions = await _timed(redis_client.mget(
+            _summary_version_key(user_id),
+            *[_summary_version_key(user_id, month) for month in missing],
+        ))
+        keys = {
+            month: _summary_key(user_id, user_version, month, month_version)
+            for month, month_version in zip(missing, month_versions)
+        }
+        values = dict(zip(missing, await _timed(redis_client.mget(list(keys.values())))))
+    except redis.RedisError:
+        return lookups
+
+    for lookup in lookups:
+        if lookup.month not in keys:
+            continue
+        lookup.redis_key = keys[lookup.month]
+        try:
+            lookup.value = json.loads(values[lookup.month]) if values[lookup.month] else None
+        except json.JSONDecodeError:
+            lookup.value = None
+        if lookup.value is None:
+            cache_stats["l2"]["misses"].inc()
+        else:
+            cache_stats["l2"]["hits"].inc()
+            _store_local(user_id, lookup.month, lookup.value, generation)
+    return lookups
+
+
+async def store_summary(lookup: SummaryLookup, value: dict):
+    _store_local(lookup.user_id, lookup.month, value, lookup.local_generation)
+    if lookup.redis_key is not None:
+        await set_cache(lookup.redis_key, value)
+
+
+async def store_summaries(entries: list[tuple[SummaryLookup, dict]]):
+    """Stores several built summaries, writing to Redis in one pipeline."""
+    for lookup, value in entries:
+        _store_local(lookup.user_id, lookup.month, value, lookup.local_generation)
+    to_redis = [(lookup.redis_key, value) for lookup, value in entries if lookup.redis_key is not None]
+    if not to_redis or not REDIS_AVAILABLE:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, value in to_redis:
+                pipe.setex(key, DEFAULT_TTL, json.dumps(value))
+            await _timed(pipe.execute())
+    except redis.RedisError:
+        pass
+
+
+def _store_local(user_id: int, month: str, value: dict, generation: int):
+    # Skip if the user's summaries were invalidated while it was being fetched.
+    if not local_cache.invalidated_since((user_id, month), generation):
+        local_cache.set((user_id, month), value)
+
+
+def _evict_local(user_id: int, months: list[str] | None):
+    if months is None:
+        local_cache.delete_scope(user_id)
+    else:
+        for month in months:
+            local_cache.delete((user_id, month))
+
+
+async def invalidate_summaries(user_id: int, months: Iterable[str] | None = None):
+    """
+    Invalidates cached summaries for the given months, or for every
+    month when months is None, here and in every other worker.
+    Versions are drawn from one global counter so a version key that
+    expired and came back never reuses an old value.
+    """
+    months = None if months is None else sorted(set(months))
+    _evict_local(user_id, months)
+    cache_invalidations.labels(kind="summary", origin="local").inc()
+
+    if not REDIS_AVAILABLE:
+        return
+    if months is None:
+        keys = [_summary_version_key(user_id)]
+    else:
+        keys = [_summary_version_key(user_id, month) for month in months]
+    if not keys:
+        return
+    message = json.dumps({"origin": WORKER_ID, "kind": "summary", "user_id": user_id, "months": months})
+    try:
+        generation = await _timed(redis_client.incr(SUMMARY_GENERATION_KEY))
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(key, generation, ex=SUMMARY_VERSION_TTL)
+            pipe.publish(INVALIDATION_CHANNEL, message)
+            await _timed(pipe.execute())
+    except redis.RedisError:
+        pass
+
+
+def _collection_version_key(user_id: int, collection: str) -> str:
+    return f"collection_version:{user_id}:{collection}"
+
+
+async def collection_version(user_id: int, collection: str) -> int | None:
+    """
+    The current version of one of a user's collections ("categories",
+    "transactions"), for ETags. None without Redis: a version that only
+    one worker knows about cannot tell when another worker changed the
+    data.
+
+    Writers delete the key (see invalidate_collections) and the next
+    reader draws a fresh value from the global generation counter, so a
+    version is never handed out twice, even after its key expired.
+    """
     if not REDIS_AVAILABLE:
+        return None
+    key = _collection_version_key(user_id, collection)
+    try:
+        version = await _timed(redis_client.get(key))
+        if version is None:
+            generation = await _timed(redis_client.incr(SUMMARY_GENERATION_KEY))
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, generation, ex=SUMMARY_VERSION_TTL, nx=True)
+                pipe.get(key)
+                _, version = await _timed(pipe.execute())
+        return int(version)
+    except (redis.RedisError, TypeError, ValueError):
+        return None
+
+
+async def invalidate_collections(user_id: int, *collections: str):
+    """
+    Retires the current version of each collection, so ETags issued for
+    it stop matching. Call after the change is committed.
+    """
+    if not REDIS_AVAILABLE or not collections:
         return
     try:
-        redis_client.setex(key, ttl, json.dumps(value))
+        await _timed(redis_client.delete(*[_collection_version_key(user_id, c) for c in collections]))
     except redis.RedisError:
         pass
 
 
-def delete_cache_pattern(pattern: str):
+async def evict_principal(user_id: int):
+    """
+    Drops a user's cached principal here and in every other worker.
+    Call it when an account is deleted or its credentials change.
+    """
+    principal_cache.delete(user_id)
+    cache_invalidations.labels(kind="principal", origin="local").inc()
     if not REDIS_AVAILABLE:
         return
+    message = json.dumps({"origin": WORKER_ID, "kind": "principal", "user_id": user_id})
     try:
-        keys = redis_client.keys(pattern)
-        if keys:
-            redis_client.delete(*keys)
+        await _timed(redis_client.publish(INVALIDATION_CHANNEL, message))
     except redis.RedisError:
-        pass
\ No newline at end of file
+        pass
+
+
+def handle_invalidation_message(data: str):
+    """Applies an invalidation published by another worker."""
+    try:
+        message = json.loads(data)
+        if message["origin"] == WORKER_ID:
+            return
+        user_id = int(message["user_id"])
+        if message["kind"] == "principal":
+            principal_cache.delete(user_id)
+            kind = "principal"
+        else:
+            _evict_local(user_id, message["months"])
+            kind = "summary"
+        cache_invalidations.labels(kind=kind, origin="peer").inc()
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        pass
+
+
+async def _listen_for_invalidations():
+    """
+    Applies invalidations from other workers for the life of the app.
+    Also tracks whether Redis is reachable: REDIS_AVAILABLE goes off when
+    the subscription fails and back on once it can subscribe again.
+    """
+    global REDIS_AVAILABLE
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            if not REDIS_AVAILABLE:
+                # Other workers' invalidations went unseen while it was down.
+                local_cache.clear()
+                principal_cache.clear()
+                REDIS_AVAILABLE = True
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    handle_invalidation_message(message["data"])
+        except redis.RedisError:
+            if REDIS_AVAILABLE:
+                # Messages may have been missed while disconnected.
+                REDIS_AVAILABLE = False
+                local_cache.clear()
+                principal_cache.clear()
+            await asyncio.sleep(REDIS_RETRY_INTERVAL)
+        finally:
+            await pubsub.aclose()
+
+
+def get_cache_stats() -> dict:
+    return {
+        "redis_available": REDIS_AVAILABLE,
+        "l1_entries": len(local_cache),
+        "l1_max_entries": local_cache.max_entries,
+        **{
+            tier: {name: counter.value for name, counter in counters.items()}
+            for tier, counters in cache_stats.items()
+        },
+    }
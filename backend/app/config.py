@@ -12,6 +12,47 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Password hashing. Changing the cost rehashes passwords on next login.
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_POOL_SIZE: int = 4  # threads per worker process
+    BCRYPT_MAX_QUEUE: int = 32  # hashes allowed to wait before returning 503
+
+    # Connection pool, per worker process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    # Open a fresh connection per checkout and disable prepared-statement
+    # caching, for running behind PgBouncer in transaction mode.
+    DB_USE_NULLPOOL: bool = False
+
+    # In-process summary cache in front of Redis, per worker process
+    CACHE_L1_MAX_ENTRIES: int = 10000
+    CACHE_L1_TTL: int = 30  # seconds
+
+    # Authenticated principals, per worker process
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL: int = 60  # seconds
+
+    # Encode list and summary responses with orjson straight from selected
+    # columns, skipping per-object response model validation, and stream
+    # unpaginated lists.
+    FAST_JSON_RESPONSES: bool = False
+
+    # Per-request instrumentation
+    SERVER_TIMING_HEADER: bool = True
+    SLOW_REQUEST_MS: float = 500.0  # log requests slower than this
+    SLOW_REQUEST_QUERIES: int = 20  # log requests running more SQL statements than this
+
+    # Categories with more transactions than this are deleted by a
+    # background job, this many transactions per database transaction.
+    DELETE_BATCH_SIZE: int = 5000
+
+    # Monthly transactions partitions on PostgreSQL to keep created
+    # beyond the current month; see app.partitions.
+    PARTITION_MONTHS_AHEAD: int = 3
+
     class Config:
         env_file = "../.env"  # Points to the .env file at project root
 
@@ -1,29 +1,168 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.config import settings
+from app.metrics import (
+    pool_capacity,
+    pool_checkout_latency,
+    pool_checkout_timeouts,
+    pool_connections_in_use,
+    pool_wait_time,
+)
+
+
+def to_async_url(url: str) -> str:
+    """
+    Swaps the blocking driver in a database URL for its asyncio
+    counterpart: asyncpg for PostgreSQL, aiosqlite for SQLite.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def dialect_insert(dialect_name: str, table):
+    """
+    An INSERT for the given dialect that supports on_conflict_do_update.
+    Both backends we run on share that API.
+    """
+    if dialect_name == "postgresql":
+        return postgresql.insert(table)
+    if dialect_name == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"upserts are not supported on {dialect_name}")
+
 
-# Create the database engine — this is the "connection" to PostgreSQL
-engine = create_engine(settings.DATABASE_URL)
+class _InstrumentedPool:
+    """
+    Records how long each checkout takes. wait time covers getting a
+    connection out of the pool (queueing when all are busy, or opening
+    a new one); checkout latency also includes pre-ping and reset.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_checkout_latency.observe(time.perf_counter() - start)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_checkout_timeouts.inc()
+            raise
+        finally:
+            pool_wait_time.observe(time.perf_counter() - start)
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_InstrumentedPool, NullPool):
+    pass
+
+
+def _connection_checked_out(dbapi_connection, connection_record, connection_proxy):
+    pool_connections_in_use.inc()
+
+
+def _connection_checked_in(dbapi_connection, connection_record):
+    pool_connections_in_use.dec()
+
+
+def _track_connections_in_use(engine: AsyncEngine) -> AsyncEngine:
+    event.listen(engine.sync_engine, "checkout", _connection_checked_out)
+    event.listen(engine.sync_engine, "checkin", _connection_checked_in)
+    return engine
+
+
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def enforce_sqlite_foreign_keys(engine):
+    """
+    SQLite ignores foreign keys, and so ON DELETE CASCADE, unless every
+    connection turns them on. Does nothing for other databases.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _enable_foreign_keys)
+    return engine
+
+
+def build_async_engine(url: str) -> AsyncEngine:
+    """Creates the request-serving engine with the pool configured in Settings."""
+    if settings.DB_USE_NULLPOOL:
+        connect_args = {}
+        if make_url(url).get_backend_name() == "postgresql":
+            # PgBouncer in transaction mode can hand each statement a
+            # different server connection, so prepared statements break.
+            connect_args = {"prepared_statement_cache_size": 0, "statement_cache_size": 0}
+        return enforce_sqlite_foreign_keys(_track_connections_in_use(create_async_engine(
+            to_async_url(url),
+            poolclass=InstrumentedNullPool,
+            connect_args=connect_args,
+        )))
+
+    pool_capacity.set(settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    return enforce_sqlite_foreign_keys(_track_connections_in_use(create_async_engine(
+        to_async_url(url),
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )))
+
+
+# Create the database engine — this is the "connection" to PostgreSQL.
+# The blocking engine is used by Alembic and command-line scripts.
+engine = enforce_sqlite_foreign_keys(create_engine(settings.DATABASE_URL))
 
 # A session is like a conversation with the database.
-# Each request to your API gets its own session.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# API requests go through the asyncio engine, so a worker can serve
+# many requests while they wait on the database instead of tying up
+# a thread each.
+async_engine = build_async_engine(settings.DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
 # Base class that all your database models will inherit from
 class Base(DeclarativeBase):
     pass
 
 
-def get_db():
+async def get_db():
     """
     Creates a new database session for each API request,
     and closes it when the request is done.
     This will be used as a FastAPI dependency.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Deletes categories too large to remove in one request. The foreign keys
+cascade, so deleting a category row removes its transactions, budgets,
+totals and alerts in one statement; for a category with many
+transactions that statement is long enough to hold locks and time out,
+so purge_category empties it a batch at a time first.
+"""
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app import models
+from app.aggregates import TotalsDelta, apply_totals_delta
+from app.cache import invalidate_collections, invalidate_summaries
+from app.config import settings
+from app.utils import month_of
+
+
+async def has_more_transactions(db: AsyncSession, category_id: int, limit: int) -> bool:
+    """True if the category has more than `limit` transactions, without counting them all."""
+    return await db.scalar(
+        select(models.Transaction.id)
+        .where(models.Transaction.category_id == category_id)
+        .offset(limit)
+        .limit(1)
+    ) is not None
+
+
+async def purge_category(engine: AsyncEngine, user_id: int, category_id: int, batch_size: int | None = None):
+    """
+    Deletes a category's transactions `batch_size` at a time, each batch
+    in its own database transaction with the matching totals, then the
+    category itself. Run as a background task. If it stops part way, the
+    data stays consistent and deleting the category again finishes it.
+    """
+    batch_size = batch_size or settings.DELETE_BATCH_SIZE
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        while True:
+            batch = (
+                select(models.Transaction.id)
+                .where(models.Transaction.category_id == category_id, models.Transaction.user_id == user_id)
+                .limit(batch_size)
+            )
+            deleted = (await db.execute(
+                delete(models.Transaction)
+                .where(models.Transaction.id.in_(batch.scalar_subquery()))
+                .returning(models.Transaction.date, models.Transaction.amount_cents)
+                .execution_options(synchronize_session=False)
+            )).all()
+            if not deleted:
+                break
+
+            delta = TotalsDelta()
+            for on, amount_cents in deleted:
+                delta.remove(category_id, on, amount_cents)
+            await apply_totals_delta(db, user_id, delta)
+            await db.commit()
+            await invalidate_summaries(user_id, {month_of(on) for on, _ in deleted})
+            await invalidate_collections(user_id, "transactions")
+
+        await db.execute(delete(models.Category).where(
+            models.Category.id == category_id,
+            models.Category.user_id == user_id,
+        ))
+        await db.commit()
+
+    await invalidate_summaries(user_id)
+    await invalidate_collections(user_id, "categories", "transactions")
@@ -1,7 +1,11 @@
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import principal_cache
 from app.database import get_db
 from app.auth import decode_access_token
 from app import models
@@ -9,10 +13,26 @@ from app import models
 security = HTTPBearer()
 
 
-def get_current_user(
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user, as routes see it. Holds only what routes
+    need, so it can be cached without touching the users table.
+    """
+    id: int
+    email: str
+
+
+def cache_principal(user: models.User) -> Principal:
+    principal = Principal(id=user.id, email=user.email)
+    principal_cache.set(user.id, principal)
+    return principal
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> models.User:
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -29,8 +49,16 @@ def get_current_user(
         raise credentials_exception
 
     user_id = int(user_id_str)
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if user is None:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    row = (await db.execute(
+        select(models.User.id, models.User.email).where(models.User.id == user_id)
+    )).first()
+    if row is None:
         raise credentials_exception
 
-    return user
\ No newline at end of file
+    principal = Principal(id=row.id, email=row.email)
+    principal_cache.set(user_id, principal)
+    return principal
@@ -0,0 +1,72 @@
+"""
+Conditional GET support. Routes look up an ETag before doing any work
+and answer a matching If-None-Match with 304 straight away:
+
+    etag = await collection_etag(current_user.id, "categories")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    ...
+    return with_etag(content, response, etag)
+
+Summaries are tagged with a hash of their cached payload; lists with a
+per-user collection version kept in Redis (see app.cache).
+"""
+import hashlib
+
+import orjson
+from fastapi import Request, Response, status
+
+from app.cache import collection_version
+
+# Responses are per user and must be revalidated before reuse.
+CACHE_CONTROL = "private, no-cache"
+
+
+def content_etag(content) -> str:
+    """A strong ETag for JSON-serializable content, stable across workers."""
+    digest = hashlib.blake2b(orjson.dumps(content, option=orjson.OPT_SORT_KEYS), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def combined_etag(etags: list[str]) -> str:
+    """One ETag for a response built from several tagged parts."""
+    digest = hashlib.blake2b("".join(etags).encode("ascii"), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+async def collection_etag(user_id: int, collection: str) -> str | None:
+    """The ETag for a user's collection, or None when no version is available."""
+    version = await collection_version(user_id, collection)
+    if version is None:
+        return None
+    return f'"{collection}-{user_id}-{version}"'
+
+
+def etag_matches(request: Request, etag: str | None) -> bool:
+    """True if the request's If-None-Match names this ETag."""
+    header = request.headers.get("if-none-match")
+    if etag is None or not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def with_etag(content, response: Response, etag: str | None):
+    """
+    Tags a route's return value. When the route returns a Response it is
+    tagged directly; otherwise the headers go on FastAPI's `response`.
+    """
+    if etag is not None:
+        target = content if isinstance(content, Response) else response
+        target.headers["ETag"] = etag
+        target.headers["Cache-Control"] = CACHE_CONTROL
+    return content
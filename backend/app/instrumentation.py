@@ -0,0 +1,155 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.metrics import (
+    db_statement_duration,
+    http_request_db_statements,
+    http_request_duration,
+    http_requests,
+    http_requests_in_progress,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestStats:
+    """What one request spent on SQL statements and Redis calls."""
+    method: str = ""
+    path: str = ""
+    route: str = "unmatched"
+    status: int = 500
+    db_queries: int = 0
+    db_time: float = 0.0
+    redis_calls: int = 0
+    redis_time: float = 0.0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def server_timing(self) -> str:
+        total = (time.perf_counter() - self.started_at) * 1000
+        return (
+            f'db;desc="{self.db_queries} queries";dur={self.db_time * 1000:.2f}, '
+            f'redis;desc="{self.redis_calls} calls";dur={self.redis_time * 1000:.2f}, '
+            f"app;dur={total:.2f}"
+        )
+
+
+# Set for the duration of each request by RequestInstrumentationMiddleware.
+# Tasks and SQLAlchemy's greenlets copy the context, and they all share
+# the one mutable RequestStats.
+_current_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+# Callbacks run with each finished request's stats; see capture_requests.
+_observers: list = []
+
+
+def record_redis_call(duration: float):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.redis_calls += 1
+        stats.redis_time += duration
+
+
+# Every engine, including the async engine's sync core, reports here.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    db_statement_duration.observe(duration)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_time += duration
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Counts and times the SQL statements and Redis calls each request
+    makes, reports them in a Server-Timing header, logs requests that
+    exceed SLOW_REQUEST_MS or SLOW_REQUEST_QUERIES, and records the
+    per-route Prometheus metrics.
+
+    Work done while a streaming body is sent happens after the headers
+    have gone, so it is only reflected in the log.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(method=scope["method"], path=scope["path"])
+        token = _current_stats.set(stats)
+        in_progress = http_requests_in_progress.labels(stats.method)
+        in_progress.inc()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                stats.status = message["status"]
+                if settings.SERVER_TIMING_HEADER:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            in_progress.dec()
+            _current_stats.reset(token)
+            # The router records the matched route in the scope. Labelling
+            # by its template, not the raw path, keeps label counts bounded.
+            route = scope.get("route")
+            if route is not None:
+                stats.route = route.path
+            _finish(stats)
+
+
+def _finish(stats: RequestStats):
+    elapsed = time.perf_counter() - stats.started_at
+    http_requests.labels(stats.method, stats.route, str(stats.status)).inc()
+    http_request_duration.labels(stats.method, stats.route).observe(elapsed)
+    http_request_db_statements.labels(stats.route).observe(stats.db_queries)
+
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms > settings.SLOW_REQUEST_MS or stats.db_queries > settings.SLOW_REQUEST_QUERIES:
+        logger.warning(
+            "Slow request %s %s: %.1fms, %d queries (%.1fms), %d redis calls (%.1fms)",
+            stats.method,
+            stats.path,
+            elapsed_ms,
+            stats.db_queries,
+            stats.db_time * 1000,
+            stats.redis_calls,
+            stats.redis_time * 1000,
+        )
+    for observer in _observers:
+        observer(stats)
+
+
+@contextmanager
+def capture_requests():
+    """Collects the stats of every request that finishes inside the block."""
+    captured: list[RequestStats] = []
+    _observers.append(captured.append)
+    try:
+        yield captured
+    finally:
+        _observers.remove(captured.append)
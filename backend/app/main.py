@@ -1,11 +1,42 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, categories, transactions, budgets, summary
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from app.auth import PasswordHasherBusy
+from app.cache import close_cache, get_cache_stats, init_cache
+from app.database import AsyncSessionLocal, async_engine
+from app.instrumentation import RequestInstrumentationMiddleware
+from app.metrics import mark_process_dead, pool_stats, render_metrics
+from app.partitions import ensure_partitions
+from app.routers import auth, categories, transactions, budgets, summary, alerts
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_cache()
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.run_sync(ensure_partitions)
+    except Exception:
+        # Rows for a month without a partition land in the default one,
+        # so a failure here is not worth refusing to start over.
+        logger.exception("Could not create upcoming transactions partitions")
+    yield
+    await close_cache()
+    await async_engine.dispose()
+    mark_process_dead()
+
 
 app = FastAPI(
     title="Budget App API",
     description="A personal budgeting application",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -16,13 +47,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added last so it wraps everything else, CORS included.
+app.add_middleware(RequestInstrumentationMiddleware)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many sign-in attempts in progress, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.include_router(auth.router)
 app.include_router(categories.router)
 app.include_router(transactions.router)
 app.include_router(budgets.router)
 app.include_router(summary.router)
+app.include_router(alerts.router)
 
 
 @app.get("/")
-def root():
-    return {"message": "Budget App API is running"}
\ No newline at end of file
+async def root():
+    return {"message": "Budget App API is running"}
+
+
+@app.get("/health/pool")
+async def db_pool_health():
+    return pool_stats(async_engine.pool)
+
+
+@app.get("/health/cache")
+async def cache_health():
+    return get_cache_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,170 @@
+"""
+In-process metrics for the /health endpoints, and the Prometheus metrics
+served at /metrics.
+
+With several worker processes, set PROMETHEUS_MULTIPROC_DIR to an empty,
+writable directory before the workers start. Every worker then writes
+its samples there and /metrics aggregates them, whichever worker serves
+the scrape.
+"""
+import os
+import threading
+
+import prometheus_client as prom
+from prometheus_client import multiprocess
+
+# Upper bounds in seconds, roughly log-spaced from 1ms to 10s.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """
+    A thread-safe monotonically increasing counter. `mirror`, usually a
+    Prometheus counter, is incremented along with it.
+    """
+
+    def __init__(self, mirror=None):
+        self._value = 0
+        self._lock = threading.Lock()
+        self._mirror = mirror
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._value += amount
+        if self._mirror is not None:
+            self._mirror.inc(amount)
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Histogram:
+    """
+    A thread-safe cumulative histogram, in the same shape Prometheus uses:
+    each bucket counts observations less than or equal to its bound.
+    `mirror`, usually a Prometheus histogram, observes the same values.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS, mirror=None):
+        self.buckets = buckets
+        self._counts = [0] * len(buckets)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+        self._mirror = mirror
+
+    def observe(self, value: float):
+        with self._lock:
+            self._count += 1
+            self._sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+        if self._mirror is not None:
+            self._mirror.observe(value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "count": self._count,
+                "sum": round(self._sum, 6),
+                "buckets": {str(bound): count for bound, count in zip(self.buckets, self._counts)},
+            }
+
+
+# Requests, recorded by app.instrumentation.RequestInstrumentationMiddleware.
+http_requests = prom.Counter(
+    "http_requests_total", "HTTP requests handled.", ["method", "route", "status"],
+)
+http_request_duration = prom.Histogram(
+    "http_request_duration_seconds", "Time to handle an HTTP request.", ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+http_requests_in_progress = prom.Gauge(
+    "http_requests_in_progress", "HTTP requests being handled.", ["method"],
+    multiprocess_mode="livesum",
+)
+http_request_db_statements = prom.Histogram(
+    "http_request_db_statements", "SQL statements run by one HTTP request.", ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+# SQL statements, recorded by the engine listeners in app.instrumentation.
+db_statement_duration = prom.Histogram(
+    "db_statement_duration_seconds", "Time to execute one SQL statement.",
+    buckets=LATENCY_BUCKETS,
+)
+
+# Database connection pool, recorded by the pool classes in app.database.
+pool_checkout_latency = Histogram(mirror=prom.Histogram(
+    "db_pool_checkout_duration_seconds", "Time to check a connection out, including pre-ping and reset.",
+    buckets=LATENCY_BUCKETS,
+))
+pool_wait_time = Histogram(mirror=prom.Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for the pool to hand over a connection.",
+    buckets=LATENCY_BUCKETS,
+))
+pool_checkout_timeouts = Counter(mirror=prom.Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT.",
+))
+pool_connections_in_use = prom.Gauge(
+    "db_pool_connections_in_use", "Connections checked out of the pool.",
+    multiprocess_mode="livesum",
+)
+pool_capacity = prom.Gauge(
+    "db_pool_capacity", "Most connections the pool will open: pool size plus overflow.",
+    multiprocess_mode="livesum",
+)
+
+# Summary and principal caches, recorded by app.cache.
+cache_requests = prom.Counter(
+    "cache_requests_total", "Summary cache lookups.", ["tier", "result"],
+)
+cache_invalidations = prom.Counter(
+    "cache_invalidations_total", "Cache invalidations applied, by what and where they came from.",
+    ["kind", "origin"],
+)
+
+# Password hashing, recorded by app.auth.
+password_hash_duration = prom.Histogram(
+    "password_hash_duration_seconds", "Time bcrypt spent on one hash or verify.", ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+password_hash_wait = prom.Histogram(
+    "password_hash_wait_seconds", "Time a hash or verify waited for a hashing thread.", ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+password_hash_rejections = prom.Counter(
+    "password_hash_rejections_total", "Hashes refused with 503 because the hashing pool was full.",
+)
+
+
+def pool_stats(pool) -> dict:
+    """Current utilization of a SQLAlchemy pool plus checkout timings."""
+    stats = {"pool_class": type(pool).__name__}
+    # NullPool keeps no connections, so it has none of these.
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if method is not None:
+            stats[name] = method()
+    stats["checkout_timeouts"] = pool_checkout_timeouts.value
+    stats["wait_time_seconds"] = pool_wait_time.snapshot()
+    stats["checkout_latency_seconds"] = pool_checkout_latency.snapshot()
+    return stats
+
+
+def render_metrics() -> bytes:
+    """Every Prometheus metric in text format, across workers when multiprocess."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = prom.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prom.REGISTRY
+    return prom.generate_latest(registry)
+
+
+def mark_process_dead():
+    """Drops this worker's live gauges from the multiprocess directory. Called at shutdown."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
@@ -1,21 +1,31 @@
 from datetime import datetime, date
-from sqlalchemy import String, Float, ForeignKey, Date, DateTime, Integer
+from sqlalchemy import DDL, BigInteger, String, Float, ForeignKey, Date, DateTime, Integer, Index, cast, event
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.utils import from_cents, to_cents
 
 
 class User(Base):
     __tablename__ = "users"
+    # Child rows go with their user or category through ON DELETE CASCADE
+    # in the database; passive_deletes stops the ORM loading them first.
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
-    categories: Mapped[list["Category"]] = relationship(back_populates="owner", cascade="all, delete-orphan")
-    transactions: Mapped[list["Transaction"]] = relationship(back_populates="owner", cascade="all, delete-orphan")
-    budgets: Mapped[list["Budget"]] = relationship(back_populates="owner", cascade="all, delete-orphan")
+    categories: Mapped[list["Category"]] = relationship(
+        back_populates="owner", cascade="all, delete-orphan", passive_deletes=True,
+    )
+    transactions: Mapped[list["Transaction"]] = relationship(
+        back_populates="owner", cascade="all, delete-orphan", passive_deletes=True,
+    )
+    budgets: Mapped[list["Budget"]] = relationship(
+        back_populates="owner", cascade="all, delete-orphan", passive_deletes=True,
+    )
 
 
 class Category(Base):
@@ -24,35 +34,163 @@ class Category(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     type: Mapped[str] = mapped_column(String, nullable=False)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True,
+    )
 
     owner: Mapped["User"] = relationship(back_populates="categories")
-    transactions: Mapped[list["Transaction"]] = relationship(back_populates="category", cascade="all, delete-orphan")
-    budgets: Mapped[list["Budget"]] = relationship(back_populates="category", cascade="all, delete-orphan")
+    transactions: Mapped[list["Transaction"]] = relationship(
+        back_populates="category", cascade="all, delete-orphan", passive_deletes=True,
+    )
+    budgets: Mapped[list["Budget"]] = relationship(
+        back_populates="category", cascade="all, delete-orphan", passive_deletes=True,
+    )
+    monthly_totals: Mapped[list["MonthlyCategoryTotal"]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True,
+    )
+    alerts: Mapped[list["BudgetAlert"]] = relationship(cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Transaction(Base):
+    # On PostgreSQL the table is partitioned by month (see app.partitions),
+    # which makes its primary key (id, date); rows are still found by id.
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_user_id_date", "user_id", "date"),
+        Index("ix_transactions_user_id_category_id_date", "user_id", "category_id", "date"),
+        # Substring search on PostgreSQL, scoped to one user's rows by
+        # btree_gin; SQLite uses transactions_fts below.
+        Index(
+            "ix_transactions_user_id_description_trgm",
+            "user_id",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    amount: Mapped[float] = mapped_column(Float, nullable=False)
+    # Money is stored as integer cents; `amount` is the decimal view the API uses.
+    amount_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=True)
     date: Mapped[date] = mapped_column(Date, nullable=False)
-    category_id: Mapped[int] = mapped_column(Integer, ForeignKey("categories.id"), nullable=False)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    category_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True,
+    )
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     owner: Mapped["User"] = relationship(back_populates="transactions")
     category: Mapped["Category"] = relationship(back_populates="transactions")
 
+    @hybrid_property
+    def amount(self) -> float:
+        return from_cents(self.amount_cents)
+
+    @amount.inplace.setter
+    def _amount_setter(self, value: float):
+        self.amount_cents = to_cents(value)
+
+    @amount.inplace.expression
+    @classmethod
+    def _amount_expression(cls):
+        return cast(cls.amount_cents, Float) / 100
+
 
 class Budget(Base):
     __tablename__ = "budgets"
+    __table_args__ = (
+        Index("ix_budgets_user_id_category_id_month", "user_id", "category_id", "month", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     month: Mapped[str] = mapped_column(String, nullable=False)
-    limit_amount: Mapped[float] = mapped_column(Float, nullable=False)
-    category_id: Mapped[int] = mapped_column(Integer, ForeignKey("categories.id"), nullable=False)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    limit_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    category_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True,
+    )
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     owner: Mapped["User"] = relationship(back_populates="budgets")
-    category: Mapped["Category"] = relationship(back_populates="budgets")
\ No newline at end of file
+    category: Mapped["Category"] = relationship(back_populates="budgets")
+
+    @hybrid_property
+    def limit_amount(self) -> float:
+        return from_cents(self.limit_cents)
+
+    @limit_amount.inplace.setter
+    def _limit_amount_setter(self, value: float):
+        self.limit_cents = to_cents(value)
+
+    @limit_amount.inplace.expression
+    @classmethod
+    def _limit_amount_expression(cls):
+        return cast(cls.limit_cents, Float) / 100
+
+
+class MonthlyCategoryTotal(Base):
+    # Maintained incrementally by every transaction write; see app.aggregates.
+    __tablename__ = "monthly_category_totals"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True,
+    )
+    category_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True, index=True,
+    )
+    month: Mapped[str] = mapped_column(String, primary_key=True)
+    total_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class BudgetAlert(Base):
+    # Written by the background scanner in app.alerts, one per budget at or past its threshold.
+    __tablename__ = "budget_alerts"
+    __table_args__ = (
+        Index("ix_budget_alerts_user_id_category_id_month", "user_id", "category_id", "month", unique=True),
+        Index("ix_budget_alerts_month_user_id", "month", "user_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    month: Mapped[str] = mapped_column(String, nullable=False)
+    severity: Mapped[str] = mapped_column(String, nullable=False)
+    spent_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    limit_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    category_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True,
+    )
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # When the alert last rose to its current severity: created_at, or the
+    # scan that took it from warning to high.
+    escalated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+# An FTS5 table shadowing transactions.description for search on SQLite,
+# kept in sync by triggers so bulk writes are covered too. The trigram
+# tokenizer matches any substring of three or more characters.
+TRANSACTIONS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+    "description, content='transactions', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE OF description ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END",
+)
+
+for _extension in ("pg_trgm", "btree_gin"):
+    event.listen(
+        Base.metadata, "before_create",
+        DDL(f"CREATE EXTENSION IF NOT EXISTS {_extension}").execute_if(dialect="postgresql"),
+    )
+for _statement in TRANSACTIONS_FTS_DDL:
+    event.listen(Transaction.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Transaction.__table__, "after_drop",
+    DDL("DROP TABLE IF EXISTS transactions_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,187 @@
+"""
+Monthly partitions of the transactions table on PostgreSQL: one per
+calendar month, plus transactions_default for dates without one.
+
+    python -m app.partitions ensure [--months-ahead N]
+    python -m app.partitions archive --before YYYY-MM [--drop]
+
+`ensure` creates the partitions for the current month and the next few,
+so new rows never pile up in the default partition. The app runs it at
+startup; also run it from cron, e.g. daily, for long-lived processes.
+`archive` detaches the partitions of older months, leaving each one a
+standalone table to dump or query, or drops them with --drop.
+
+Archiving keeps monthly_category_totals, so summaries still cover the
+archived months. `python -m app.aggregates rebuild` recomputes from the
+transactions still attached and would drop those totals.
+
+On SQLite transactions is an ordinary table and both commands do nothing.
+"""
+import argparse
+import re
+import sys
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.utils import month_of, month_range, months_between
+
+DEFAULT_PARTITION = "transactions_default"
+
+# pg_advisory_xact_lock key that serializes partition maintenance
+# between processes, such as several workers starting at once.
+MAINTENANCE_LOCK_KEY = 0x7472616E  # "tran"
+
+_PARTITION_NAME = re.compile(r"^transactions_(\d{4})_(\d{2})$")
+
+
+def partition_name(month: str) -> str:
+    """The partition table for a "YYYY-MM" month: transactions_YYYY_MM."""
+    return "transactions_" + month.replace("-", "_")
+
+
+def is_partition_name(name: str) -> bool:
+    """Whether a table name is one of the partitions of transactions."""
+    return name == DEFAULT_PARTITION or _PARTITION_NAME.match(name) is not None
+
+
+def upcoming_months(today: date, months_ahead: int) -> list[str]:
+    """The month `today` is in and the months_ahead after it."""
+    year, mo = divmod(today.year * 12 + today.month - 1 + months_ahead, 12)
+    return months_between(today, date(year, mo + 1, 1))
+
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('transactions'))"
+    ))
+
+
+def list_partitions(db: Session) -> list[str]:
+    """Months with a partition attached, oldest first."""
+    names = db.scalars(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = 'transactions'::regclass"
+    ))
+    return sorted(
+        f"{match[1]}-{match[2]}"
+        for match in map(_PARTITION_NAME.match, names)
+        if match
+    )
+
+
+def create_partition(db: Session, month: str):
+    """
+    Adds the partition for one month, moving across any rows for it
+    already in the default partition. The table is built on its own and
+    then attached, which unlike CREATE TABLE ... PARTITION OF leaves
+    transactions readable and writable meanwhile. Does not commit.
+    """
+    start, end = month_range(month)
+    name = partition_name(month)
+    # Keeps new rows for this month out of the default partition until
+    # it is attached; reads carry on.
+    db.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE"))
+    db.execute(text(f"CREATE TABLE {name} (LIKE transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"start": start, "end": end},
+    )
+    db.execute(text(
+        f"ALTER TABLE transactions ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+
+
+def ensure_partitions(db: Session, months_ahead: int | None = None, today: date | None = None) -> list[str]:
+    """
+    Creates whichever partitions are missing from the current month
+    through months_ahead months ahead. Returns the months created, none
+    if transactions is not partitioned.
+    """
+    if not is_partitioned(db):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+    existing = set(list_partitions(db))
+    created = [month for month in upcoming_months(today or date.today(), months_ahead) if month not in existing]
+    for month in created:
+        create_partition(db, month)
+    db.commit()
+    return created
+
+
+def archive_partitions(db: Session, before: str, drop: bool = False, today: date | None = None) -> list[str]:
+    """
+    Detaches the partition of every month before `before` ("YYYY-MM"),
+    which may be the current month at the latest. Their rows leave
+    transactions, and with drop the tables are deleted too. Commits
+    after each partition. Returns the months archived.
+    """
+    if before > month_of(today or date.today()):
+        raise ValueError("can only archive months before the current one")
+    if not is_partitioned(db):
+        return []
+
+    archived = []
+    for month in list_partitions(db):
+        if month >= before:
+            break
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+        name = partition_name(month)
+        db.execute(text(f"ALTER TABLE transactions DETACH PARTITION {name}"))
+        if drop:
+            db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        archived.append(month)
+    return archived
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.partitions", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=["ensure", "archive"])
+    parser.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--before", help="YYYY-MM, archive the months before this one")
+    parser.add_argument("--drop", action="store_true", help="drop archived partitions instead of keeping them")
+    args = parser.parse_args(argv)
+
+    if args.command == "archive":
+        if args.before is None:
+            parser.error("archive needs --before YYYY-MM")
+        try:
+            start, _ = month_range(args.before)
+        except ValueError:
+            parser.error("month must be in format YYYY-MM (e.g. 2026-02)")
+        args.before = month_of(start)
+
+    with SessionLocal() as db:
+        if not is_partitioned(db):
+            print("transactions is not partitioned, nothing to do")
+            return 0
+
+        if args.command == "ensure":
+            created = ensure_partitions(db, args.months_ahead)
+            print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+            return 0
+
+        try:
+            archived = archive_partitions(db, args.before, args.drop)
+        except ValueError as exc:
+            parser.error(str(exc))
+    print(f"{'Dropped' if args.drop else 'Detached'} {len(archived)} partitions: {', '.join(archived) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
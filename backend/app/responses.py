@@ -0,0 +1,61 @@
+from typing import AsyncIterator
+
+import orjson
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+
+from app.config import settings
+
+STREAM_BATCH_SIZE = 1000
+
+
+class FastJSONResponse(Response):
+    """
+    Encodes plain dicts and lists with orjson. Returning one from a route
+    skips FastAPI's response_model validation, so only use it for data
+    that already has the response shape, such as rows selected with
+    response_columns.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+def fast_json(content):
+    """Wraps already-serializable content in a FastJSONResponse when FAST_JSON_RESPONSES is on."""
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(content)
+    return content
+
+
+def response_columns(model, schema: type[BaseModel]) -> list:
+    """
+    The model's columns (or hybrid attributes) named by the schema's
+    fields, in field order and labelled with the field names.
+    """
+    return [getattr(model, name).label(name) for name in schema.model_fields]
+
+
+def row_dicts(rows) -> list[dict]:
+    return [row._asdict() for row in rows]
+
+
+async def iter_json_array(rows: AsyncIterator) -> AsyncIterator[bytes]:
+    """Encodes streamed rows as one JSON array, yielding one chunk per STREAM_BATCH_SIZE rows."""
+    yield b"["
+    separator = b""
+    chunk = []
+    async for row in rows:
+        chunk.append(orjson.dumps(row._asdict()))
+        if len(chunk) == STREAM_BATCH_SIZE:
+            yield separator + b",".join(chunk)
+            separator = b","
+            chunk = []
+    if chunk:
+        yield separator + b",".join(chunk)
+    yield b"]"
+
+
+def stream_json_array(rows: AsyncIterator) -> StreamingResponse:
+    return StreamingResponse(iter_json_array(rows), media_type="application/json")
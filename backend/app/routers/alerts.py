@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.database import get_db
+from app import models, schemas
+from app.dependencies import Principal, get_current_user
+from app.utils import from_cents, month_of, month_range
+
+router = APIRouter(prefix="/alerts", tags=["Alerts"])
+
+
+@router.get("/", response_model=List[schemas.BudgetAlertResponse])
+async def get_alerts(
+    month: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Alerts recorded by the background scanner (python -m app.alerts scan)."""
+    query = (
+        select(models.BudgetAlert, models.Category.name)
+        .join(models.Category, models.Category.id == models.BudgetAlert.category_id)
+        .where(models.BudgetAlert.user_id == current_user.id)
+    )
+
+    if month:
+        try:
+            start, _ = month_range(month)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Month must be in format YYYY-MM (e.g. 2026-02)",
+            )
+        query = query.where(models.BudgetAlert.month == month_of(start))
+
+    rows = (await db.execute(
+        query.order_by(models.BudgetAlert.month.desc(), models.BudgetAlert.id)
+    )).all()
+
+    return [
+        {
+            "id": alert.id,
+            "month": alert.month,
+            "severity": alert.severity,
+            "spent": from_cents(alert.spent_cents),
+            "limit_amount": from_cents(alert.limit_cents),
+            "category_id": alert.category_id,
+            "category_name": category_name,
+            "created_at": alert.created_at,
+            "escalated_at": alert.escalated_at,
+            "updated_at": alert.updated_at,
+        }
+        for alert, category_name in rows
+    ]
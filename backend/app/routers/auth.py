@@ -1,16 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app import models, schemas
-from app.auth import hash_password, verify_password, create_access_token
+from app.auth import (
+    PasswordHasherBusy,
+    create_access_token,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
+from app.dependencies import cache_principal
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(models.User).filter(models.User.email == user_data.email).first()
+async def register(user_data: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
+    existing_user = await db.scalar(select(models.User).where(models.User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -19,22 +27,32 @@ def register(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
 
     new_user = models.User(
         email=user_data.email,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await hash_password_async(user_data.password),
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 
 @router.post("/login", response_model=schemas.Token)
-def login(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == user_data.email).first()
-    if not user or not verify_password(user_data.password, user.hashed_password):
+async def login(user_data: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
+    user = await db.scalar(select(models.User).where(models.User.email == user_data.email))
+    if not user or not await verify_password_async(user_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
+    # Upgrade the hash to the configured cost while we have the password.
+    if needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await hash_password_async(user_data.password)
+            await db.commit()
+        except PasswordHasherBusy:
+            pass
+
+    # The next request will almost certainly come from this user.
+    cache_principal(user)
     access_token = create_access_token(data={"sub": str(user.id)})
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
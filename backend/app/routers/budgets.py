@@ -1,33 +1,37 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
+from app.cache import invalidate_summaries
+from app.config import settings
 from app.database import get_db
 from app import models, schemas
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_user
+from app.responses import response_columns, stream_json_array
 
 router = APIRouter(prefix="/budgets", tags=["Budgets"])
 
 
 @router.post("/", response_model=schemas.BudgetResponse, status_code=status.HTTP_201_CREATED)
-def create_budget(
+async def create_budget(
     budget_data: schemas.BudgetCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    category = db.query(models.Category).filter(
+    category = await db.scalar(select(models.Category).where(
         models.Category.id == budget_data.category_id,
         models.Category.user_id == current_user.id,
-    ).first()
+    ))
 
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
 
-    existing_budget = db.query(models.Budget).filter(
+    existing_budget = await db.scalar(select(models.Budget).where(
         models.Budget.category_id == budget_data.category_id,
         models.Budget.month == budget_data.month,
         models.Budget.user_id == current_user.id,
-    ).first()
+    ))
 
     if existing_budget:
         raise HTTPException(
@@ -42,35 +46,43 @@ def create_budget(
         user_id=current_user.id,
     )
     db.add(new_budget)
-    db.commit()
-    db.refresh(new_budget)
+    await db.commit()
+    await db.refresh(new_budget)
+    await invalidate_summaries(current_user.id, [new_budget.month])
     return new_budget
 
 
 @router.get("/", response_model=List[schemas.BudgetResponse])
-def get_budgets(
+async def get_budgets(
     month: str = None,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    query = db.query(models.Budget).filter(models.Budget.user_id == current_user.id)
+    if settings.FAST_JSON_RESPONSES:
+        query = select(*response_columns(models.Budget, schemas.BudgetResponse))
+    else:
+        query = select(models.Budget)
+    query = query.where(models.Budget.user_id == current_user.id)
 
     if month:
-        query = query.filter(models.Budget.month == month)
+        query = query.where(models.Budget.month == month)
 
-    return query.all()
+    if settings.FAST_JSON_RESPONSES:
+        return stream_json_array(await db.stream(query))
+
+    return (await db.scalars(query)).all()
 
 
 @router.get("/{budget_id}", response_model=schemas.BudgetResponse)
-def get_budget(
+async def get_budget(
     budget_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    budget = db.query(models.Budget).filter(
+    budget = await db.scalar(select(models.Budget).where(
         models.Budget.id == budget_id,
         models.Budget.user_id == current_user.id,
-    ).first()
+    ))
 
     if not budget:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Budget not found")
@@ -79,42 +91,59 @@ def get_budget(
 
 
 @router.put("/{budget_id}", response_model=schemas.BudgetResponse)
-def update_budget(
+async def update_budget(
     budget_id: int,
     budget_data: schemas.BudgetCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    budget = db.query(models.Budget).filter(
+    budget = await db.scalar(select(models.Budget).where(
         models.Budget.id == budget_id,
         models.Budget.user_id == current_user.id,
-    ).first()
+    ))
 
     if not budget:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Budget not found")
 
+    existing_budget = await db.scalar(select(models.Budget).where(
+        models.Budget.category_id == budget_data.category_id,
+        models.Budget.month == budget_data.month,
+        models.Budget.user_id == current_user.id,
+        models.Budget.id != budget_id,
+    ))
+
+    if existing_budget:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Budget already exists for this category and month",
+        )
+
+    old_month = budget.month
+
     budget.month = budget_data.month
     budget.limit_amount = budget_data.limit_amount
     budget.category_id = budget_data.category_id
-    db.commit()
-    db.refresh(budget)
+    await db.commit()
+    await db.refresh(budget)
+    await invalidate_summaries(current_user.id, [old_month, budget.month])
     return budget
 
 
 @router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_budget(
+async def delete_budget(
     budget_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    budget = db.query(models.Budget).filter(
+    budget = await db.scalar(select(models.Budget).where(
         models.Budget.id == budget_id,
         models.Budget.user_id == current_user.id,
-    ).first()
+    ))
 
     if not budget:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Budget not found")
 
-    db.delete(budget)
-    db.commit()
+    await db.delete(budget)
+    await db.commit()
+    await invalidate_summaries(current_user.id, [budget.month])
     return None
\ No newline at end of file
@@ -1,19 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
+from app.cache import invalidate_collections, invalidate_summaries
+from app.config import settings
 from app.database import get_db
+from app.deletion import has_more_transactions, purge_category
 from app import models, schemas
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_user
+from app.etags import collection_etag, etag_matches, not_modified, with_etag
+from app.responses import response_columns, stream_json_array
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
 
 @router.post("/", response_model=schemas.CategoryResponse, status_code=status.HTTP_201_CREATED)
-def create_category(
+async def create_category(
     category_data: schemas.CategoryCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     if category_data.type not in ("income", "expense"):
         raise HTTPException(
@@ -27,29 +33,46 @@ def create_category(
         user_id=current_user.id,
     )
     db.add(new_category)
-    db.commit()
-    db.refresh(new_category)
+    await db.commit()
+    await db.refresh(new_category)
+    # Every month's summary lists every category.
+    await invalidate_summaries(current_user.id)
+    await invalidate_collections(current_user.id, "categories")
     return new_category
 
 
 @router.get("/", response_model=List[schemas.CategoryResponse])
-def get_categories(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+async def get_categories(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return db.query(models.Category).filter(models.Category.user_id == current_user.id).all()
+    etag = await collection_etag(current_user.id, "categories")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    if settings.FAST_JSON_RESPONSES:
+        return with_etag(stream_json_array(await db.stream(
+            select(*response_columns(models.Category, schemas.CategoryResponse))
+            .where(models.Category.user_id == current_user.id)
+        )), response, etag)
+
+    return with_etag((await db.scalars(
+        select(models.Category).where(models.Category.user_id == current_user.id)
+    )).all(), response, etag)
 
 
 @router.get("/{category_id}", response_model=schemas.CategoryResponse)
-def get_category(
+async def get_category(
     category_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    category = db.query(models.Category).filter(
+    category = await db.scalar(select(models.Category).where(
         models.Category.id == category_id,
         models.Category.user_id == current_user.id,
-    ).first()
+    ))
 
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
@@ -58,16 +81,16 @@ def get_category(
 
 
 @router.put("/{category_id}", response_model=schemas.CategoryResponse)
-def update_category(
+async def update_category(
     category_id: int,
     category_data: schemas.CategoryCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    category = db.query(models.Category).filter(
+    category = await db.scalar(select(models.Category).where(
         models.Category.id == category_id,
         models.Category.user_id == current_user.id,
-    ).first()
+    ))
 
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
@@ -80,25 +103,40 @@ def update_category(
 
     category.name = category_data.name
     category.type = category_data.type
-    db.commit()
-    db.refresh(category)
+    await db.commit()
+    await db.refresh(category)
+    await invalidate_summaries(current_user.id)
+    await invalidate_collections(current_user.id, "categories")
     return category
 
 
-@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_category(
+@router.delete(
+    "/{category_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"description": "A large category is being deleted in the background"}},
+)
+async def delete_category(
     category_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    category = db.query(models.Category).filter(
+    category = await db.scalar(select(models.Category).where(
         models.Category.id == category_id,
         models.Category.user_id == current_user.id,
-    ).first()
+    ))
 
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
 
-    db.delete(category)
-    db.commit()
+    if await has_more_transactions(db, category.id, settings.DELETE_BATCH_SIZE):
+        background_tasks.add_task(purge_category, db.bind, current_user.id, category.id)
+        return Response(status_code=status.HTTP_202_ACCEPTED)
+
+    # One DELETE: the database cascades it to the category's rows.
+    await db.delete(category)
+    await db.commit()
+    await invalidate_summaries(current_user.id)
+    # The category's transactions went with it.
+    await invalidate_collections(current_user.id, "categories", "transactions")
     return None
\ No newline at end of file
@@ -1,115 +1,284 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import BigInteger, and_, cast, func, literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app import models
-from app.dependencies import get_current_user
-from app.cache import get_cache, set_cache
+from app.dependencies import Principal, get_current_user
+from app.etags import combined_etag, content_etag, etag_matches, not_modified, with_etag
+from app.responses import fast_json
+from app.cache import lookup_summaries, lookup_summary, store_summaries, store_summary
+from app.utils import from_cents, month_of, month_range, months_between
 
 router = APIRouter(prefix="/summary", tags=["Summary"])
 
+# Longest range /summary/range will compute in one request.
+MAX_RANGE_MONTHS = 36
 
-@router.get("/monthly/{month}")
-def get_monthly_summary(
-    month: str,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
-):
-    try:
-        year, mo = month.split("-")
-        year = int(year)
-        mo = int(mo)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Month must be in format YYYY-MM (e.g. 2026-02)",
-        )
-
-    cache_key = f"summary:{current_user.id}:{month}"
-    cached = get_cache(cache_key)
-    if cached:
-        return cached
-
-    categories = db.query(models.Category).filter(
-        models.Category.user_id == current_user.id,
-        models.Category.type == "expense",
-    ).all()
 
+def _build_summary(month: str, rows) -> dict:
+    """
+    Builds a monthly summary from (category_id, name, type, spent, limit)
+    rows, one per category in id order. Money stays in integer cents,
+    which is also how summaries are cached; see _present_summary. The
+    summary carries its own ETag, so a conditional request for a cached
+    summary needs neither the database nor serialization.
+    """
     category_summaries = []
+    income = 0
 
-    for category in categories:
-        spent = db.query(func.coalesce(func.sum(models.Transaction.amount), 0)).filter(
-            models.Transaction.user_id == current_user.id,
-            models.Transaction.category_id == category.id,
-            extract("year", models.Transaction.date) == year,
-            extract("month", models.Transaction.date) == mo,
-        ).scalar()
-
-        spent = float(spent)
-
-        budget = db.query(models.Budget).filter(
-            models.Budget.user_id == current_user.id,
-            models.Budget.category_id == category.id,
-            models.Budget.month == month,
-        ).first()
+    for category_id, name, category_type, spent, limit_cents in rows:
+        spent = int(spent)
 
-        limit_amount = budget.limit_amount if budget else None
+        if category_type == "income":
+            income += spent
+            continue
 
-        if limit_amount is None:
+        if limit_cents is None:
             status_label = "no_budget_set"
-        elif spent >= limit_amount:
+        elif spent >= limit_cents:
             status_label = "over_budget"
-        elif spent >= limit_amount * 0.8:
+        elif spent * 5 >= limit_cents * 4:  # at least 80%
             status_label = "near_limit"
         else:
             status_label = "under_budget"
 
         category_summaries.append({
-            "category_id": category.id,
-            "name": category.name,
+            "category_id": category_id,
+            "name": name,
             "spent": spent,
-            "limit": limit_amount,
-            "remaining": round(limit_amount - spent, 2) if limit_amount else None,
-            "percentage": round((spent / limit_amount) * 100, 1) if limit_amount else None,
+            "limit": limit_cents,
+            "remaining": limit_cents - spent if limit_cents else None,
+            "percentage": round(spent * 100 / limit_cents, 1) if limit_cents else None,
             "status": status_label,
         })
 
     total_spent = sum(c["spent"] for c in category_summaries)
     total_limit = sum(c["limit"] for c in category_summaries if c["limit"] is not None)
 
-    income = db.query(func.coalesce(func.sum(models.Transaction.amount), 0)).join(
-        models.Category
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Category.type == "income",
-        extract("year", models.Transaction.date) == year,
-        extract("month", models.Transaction.date) == mo,
-    ).scalar()
-
-    income = float(income)
-
-    result = {
+    summary = {
         "month": month,
         "total_income": income,
         "total_spent": total_spent,
         "total_budget_limit": total_limit,
-        "net": round(income - total_spent, 2),
+        "net": income - total_spent,
         "categories": category_summaries,
     }
+    summary["etag"] = content_etag(summary)
+    return summary
+
+
+def _money(cents: int | None) -> float | None:
+    return None if cents is None else from_cents(cents)
 
-    set_cache(cache_key, result)
+
+def _present_summary(summary: dict) -> dict:
+    """Converts a summary's cent amounts to the decimal amounts the API returns."""
+    return {
+        "month": summary["month"],
+        "total_income": _money(summary["total_income"]),
+        "total_spent": _money(summary["total_spent"]),
+        "total_budget_limit": _money(summary["total_budget_limit"]),
+        "net": _money(summary["net"]),
+        "categories": [
+            {
+                **category,
+                "spent": _money(category["spent"]),
+                "limit": _money(category["limit"]),
+                "remaining": _money(category["remaining"]),
+            }
+            for category in summary["categories"]
+        ],
+    }
+
+
+@router.get("/monthly/{month}")
+async def get_monthly_summary(
+    month: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    summary = await _monthly_summary(month, db, current_user)
+    if etag_matches(request, summary["etag"]):
+        return not_modified(summary["etag"])
+    return with_etag(fast_json(_present_summary(summary)), response, summary["etag"])
+
+
+async def _monthly_summary(month: str, db: AsyncSession, current_user: Principal) -> dict:
+    try:
+        start, end = month_range(month)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month must be in format YYYY-MM (e.g. 2026-02)",
+        )
+
+    # Normalise so "2026-2" and "2026-02" share a cache entry, which
+    # writes invalidate by month_of(date), and read the same rows.
+    month = month_of(start)
+
+    cached = await lookup_summary(current_user.id, month)
+    if cached.value is not None:
+        return cached.value
+
+    # One round trip over pre-aggregated rows: every category with its
+    # spending and budget for the month.
+    rows = (await db.execute(
+        select(
+            models.Category.id,
+            models.Category.name,
+            models.Category.type,
+            func.coalesce(models.MonthlyCategoryTotal.total_cents, 0),
+            models.Budget.limit_cents,
+        )
+        .outerjoin(
+            models.MonthlyCategoryTotal,
+            and_(
+                models.MonthlyCategoryTotal.category_id == models.Category.id,
+                models.MonthlyCategoryTotal.user_id == current_user.id,
+                models.MonthlyCategoryTotal.month == month,
+            ),
+        )
+        .outerjoin(
+            models.Budget,
+            and_(
+                models.Budget.category_id == models.Category.id,
+                models.Budget.user_id == current_user.id,
+                models.Budget.month == month,
+            ),
+        )
+        .where(models.Category.user_id == current_user.id)
+        .order_by(models.Category.id)
+    )).all()
+
+    result = _build_summary(month, rows)
+
+    await store_summary(cached, result)
 
     return result
 
 
+@router.get("/range")
+async def get_summary_range(
+    request: Request,
+    response: Response,
+    from_month: str = Query(..., alias="from"),
+    to_month: str = Query(..., alias="to"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    try:
+        first, _ = month_range(from_month)
+        last, _ = month_range(to_month)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month must be in format YYYY-MM (e.g. 2026-02)",
+        )
+
+    if first > last:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'",
+        )
+
+    months = months_between(first, last)
+    if len(months) > MAX_RANGE_MONTHS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range must not exceed {MAX_RANGE_MONTHS} months",
+        )
+
+    lookups = await lookup_summaries(current_user.id, months)
+    missing = [lookup.month for lookup in lookups if lookup.value is None]
+
+    if missing:
+        # Spending and budgets for every missing month, grouped by month
+        # and category, then joined to every category so months without
+        # activity still list them. One query however long the range.
+        activity = union_all(
+            select(
+                models.MonthlyCategoryTotal.category_id,
+                models.MonthlyCategoryTotal.month,
+                models.MonthlyCategoryTotal.total_cents.label("spent"),
+                cast(null(), BigInteger).label("limit_cents"),
+            ).where(
+                models.MonthlyCategoryTotal.user_id == current_user.id,
+                models.MonthlyCategoryTotal.month.in_(missing),
+            ),
+            select(
+                models.Budget.category_id,
+                models.Budget.month,
+                literal(0, BigInteger).label("spent"),
+                models.Budget.limit_cents,
+            ).where(
+                models.Budget.user_id == current_user.id,
+                models.Budget.month.in_(missing),
+            ),
+        ).subquery()
+        grouped = (
+            select(
+                activity.c.category_id,
+                activity.c.month,
+                func.sum(activity.c.spent).label("spent"),
+                func.max(activity.c.limit_cents).label("limit_cents"),
+            )
+            .group_by(activity.c.month, activity.c.category_id)
+            .subquery()
+        )
+        rows = (await db.execute(
+            select(
+                models.Category.id,
+                models.Category.name,
+                models.Category.type,
+                grouped.c.month,
+                grouped.c.spent,
+                grouped.c.limit_cents,
+            )
+            .outerjoin(grouped, grouped.c.category_id == models.Category.id)
+            .where(models.Category.user_id == current_user.id)
+            .order_by(models.Category.id)
+        )).all()
+
+        categories = {}
+        by_month = {}
+        for category_id, name, category_type, month, spent, limit_cents in rows:
+            categories[category_id] = (name, category_type)
+            if month is not None:
+                by_month[(month, category_id)] = (spent, limit_cents)
+
+        built = []
+        for lookup in lookups:
+            if lookup.value is not None:
+                continue
+            month_rows = [
+                (category_id, name, category_type, *by_month.get((lookup.month, category_id), (0, None)))
+                for category_id, (name, category_type) in categories.items()
+            ]
+            lookup.value = _build_summary(lookup.month, month_rows)
+            built.append((lookup, lookup.value))
+
+        await store_summaries(built)
+
+    etag = combined_etag([lookup.value["etag"] for lookup in lookups])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return with_etag(fast_json({
+        "from": months[0],
+        "to": months[-1],
+        "months": [_present_summary(lookup.value) for lookup in lookups],
+    }), response, etag)
+
+
 @router.get("/alerts/{month}")
-def get_budget_alerts(
+async def get_budget_alerts(
     month: str,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    summary = get_monthly_summary(month, db, current_user)
+    summary = _present_summary(await _monthly_summary(month, db, current_user))
 
     alerts = []
 
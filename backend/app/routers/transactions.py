@@ -1,25 +1,47 @@
-from app.cache import delete_cache_pattern
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import base64
+from collections import defaultdict
+from datetime import date
+
+from app.aggregates import TotalsDelta, apply_totals_delta
+from app.bulk import (
+    EXPORT_BATCH_SIZE,
+    detect_import_format,
+    insert_transactions,
+    iter_export_csv,
+    iter_export_ndjson,
+    iter_import_rows,
+    next_import_batch,
+)
+from app.cache import invalidate_collections, invalidate_summaries
+from app.config import settings
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
 
 from app.database import get_db
 from app import models, schemas
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_user
+from app.etags import collection_etag, etag_matches, not_modified, with_etag
+from app.responses import FastJSONResponse, response_columns, row_dicts
+from app.search import search_transactions
+from app.utils import from_cents, month_of, month_range, to_cents
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
 
 @router.post("/", response_model=schemas.TransactionResponse, status_code=status.HTTP_201_CREATED)
-def create_transaction(
+async def create_transaction(
     transaction_data: schemas.TransactionCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    category = db.query(models.Category).filter(
+    category = await db.scalar(select(models.Category).where(
         models.Category.id == transaction_data.category_id,
         models.Category.user_id == current_user.id,
-    ).first()
+    ))
 
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
@@ -32,46 +54,428 @@ def create_transaction(
         user_id=current_user.id,
     )
     db.add(new_transaction)
-    db.commit()
-    db.refresh(new_transaction)
-    delete_cache_pattern(f"summary:{current_user.id}:*")
+    delta = TotalsDelta()
+    delta.add(new_transaction.category_id, new_transaction.date, new_transaction.amount_cents)
+    await apply_totals_delta(db, current_user.id, delta)
+    await db.commit()
+    await db.refresh(new_transaction)
+    await invalidate_summaries(current_user.id, [month_of(new_transaction.date)])
+    await invalidate_collections(current_user.id, "transactions")
     return new_transaction
-    
 
 
-@router.get("/", response_model=List[schemas.TransactionResponse])
-def get_transactions(
-    category_id: Optional[int] = Query(None),
-    month: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+@router.post("/import", response_model=schemas.TransactionImportResult)
+async def import_transactions(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    query = db.query(models.Transaction).filter(models.Transaction.user_id == current_user.id)
+    fmt = format or detect_import_format(file.filename, file.content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Could not detect file format; pass format=csv or format=ndjson",
+        )
+
+    # category_id -> whether it belongs to the current user
+    owned_categories: dict[int, bool] = {}
+    errors = []
+    imported = 0
+    imported_months = set()
+    delta = TotalsDelta()
+
+    rows = iter_import_rows(file.file, fmt)
+    while True:
+        try:
+            # Parsing reads the spooled upload from disk, so do it off the event loop.
+            parsed = await run_in_threadpool(next_import_batch, rows)
+        except UnicodeDecodeError:
+            # Nothing is committed until the end, so the import is all or nothing here.
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File is not valid UTF-8; save it as UTF-8 and import it again",
+            )
+        if not parsed:
+            break
+
+        pending = []
+        for row_number, transaction, error in parsed:
+            if error:
+                errors.append({"row": row_number, "error": error})
+            else:
+                pending.append((row_number, transaction))
+
+        unknown = {t.category_id for _, t in pending} - owned_categories.keys()
+        if unknown:
+            found = set((await db.scalars(select(models.Category.id).where(
+                models.Category.id.in_(unknown),
+                models.Category.user_id == current_user.id,
+            ))).all())
+            for category_id in unknown:
+                owned_categories[category_id] = category_id in found
+
+        batch = []
+        for row_number, transaction in pending:
+            if not owned_categories[transaction.category_id]:
+                errors.append({"row": row_number, "error": "Category not found"})
+                continue
+            try:
+                amount_cents = to_cents(transaction.amount)
+            except (ArithmeticError, ValueError):
+                errors.append({"row": row_number, "error": "amount: Input should be a valid amount"})
+                continue
+            batch.append({
+                "amount_cents": amount_cents,
+                "description": transaction.description,
+                "date": transaction.date,
+                "category_id": transaction.category_id,
+                "user_id": current_user.id,
+            })
+
+        await insert_transactions(db, batch)
+        imported += len(batch)
+        for row in batch:
+            imported_months.add(month_of(row["date"]))
+            delta.add(row["category_id"], row["date"], row["amount_cents"])
+
+    await apply_totals_delta(db, current_user.id, delta)
+    await db.commit()
+
+    if imported:
+        await invalidate_summaries(current_user.id, imported_months)
+        await invalidate_collections(current_user.id, "transactions")
+
+    errors.sort(key=lambda e: e["row"])
+    return {"imported": imported, "errors": errors}
+
+
+# Columns a batch reads and writes for each transaction it touches.
+_BATCH_FIELDS = ("amount_cents", "description", "date", "category_id")
+
+# Fields an update may leave out but not set to null.
+_REQUIRED_FIELDS = ("amount", "date", "category_id")
+
+
+def _nulled_required_field(changes: dict) -> str | None:
+    return next((f for f in _REQUIRED_FIELDS if f in changes and changes[f] is None), None)
+
+
+def _batch_transaction(transaction_id: int | None, state: dict, user_id: int) -> dict:
+    return {
+        "id": transaction_id,
+        "user_id": user_id,
+        "amount": from_cents(state["amount_cents"]),
+        "description": state["description"],
+        "date": state["date"],
+        "category_id": state["category_id"],
+    }
+
+
+@router.post("/batch", response_model=schemas.TransactionBatchResult)
+async def batch_transactions(
+    batch: schemas.TransactionBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Applies create, update and delete operations in order, in one
+    database transaction. An operation that names a missing transaction
+    or category is reported in its result and skipped; the rest apply.
+    """
+    operations = batch.operations
+
+    # Everything the batch refers to, one query each: the transactions it
+    # updates or deletes, and the categories it assigns. The transactions
+    # are locked, as in update_transaction, and in id order so that two
+    # overlapping batches cannot deadlock.
+    target_ids = {op.id for op in operations if op.op != "create"}
+    states: dict[int, dict] = {}
+    if target_ids:
+        rows = await db.execute(
+            select(models.Transaction.id, *(getattr(models.Transaction, f) for f in _BATCH_FIELDS))
+            .where(models.Transaction.id.in_(target_ids), models.Transaction.user_id == current_user.id)
+            .order_by(models.Transaction.id)
+            .with_for_update()
+        )
+        states = {row.id: {f: getattr(row, f) for f in _BATCH_FIELDS} for row in rows}
+
+    category_ids = {
+        op.category_id for op in operations
+        if op.op != "delete" and op.category_id is not None
+    }
+    owned_categories = set()
+    if category_ids:
+        owned_categories = set((await db.scalars(select(models.Category.id).where(
+            models.Category.id.in_(category_ids),
+            models.Category.user_id == current_user.id,
+        ))).all())
+
+    # Work out every operation's effect in memory first, so each kind of
+    # write below is a single statement.
+    results = []
+    creates = []
+    updated_ids = set()
+    deleted_ids = set()
+    months = set()
+    delta = TotalsDelta()
+
+    for index, op in enumerate(operations):
+        result = {"index": index, "op": op.op, "status": "error"}
+        results.append(result)
+
+        if op.op == "create":
+            if op.category_id not in owned_categories:
+                result["error"] = "Category not found"
+                continue
+            state = {
+                "amount_cents": to_cents(op.amount),
+                "description": op.description,
+                "date": op.date,
+                "category_id": op.category_id,
+            }
+            creates.append((result, state))
+            delta.add(state["category_id"], state["date"], state["amount_cents"])
+            months.add(month_of(state["date"]))
+            result["status"] = "ok"
+            continue
+
+        state = states.get(op.id)
+        if state is None or op.id in deleted_ids:
+            result["error"] = "Transaction not found"
+            continue
+
+        if op.op == "delete":
+            delta.remove(state["category_id"], state["date"], state["amount_cents"])
+            months.add(month_of(state["date"]))
+            deleted_ids.add(op.id)
+            result.update(status="ok", id=op.id)
+            continue
+
+        changes = op.model_dump(exclude_unset=True, exclude={"op", "id"})
+        nulled = _nulled_required_field(changes)
+        if nulled:
+            result["error"] = f"{nulled} cannot be null"
+            continue
+        if "category_id" in changes and changes["category_id"] not in owned_categories:
+            result["error"] = "Category not found"
+            continue
+        if "amount" in changes:
+            changes["amount_cents"] = to_cents(changes.pop("amount"))
+
+        new_state = {**state, **changes}
+        delta.remove(state["category_id"], state["date"], state["amount_cents"])
+        delta.add(new_state["category_id"], new_state["date"], new_state["amount_cents"])
+        months.update((month_of(state["date"]), month_of(new_state["date"])))
+        states[op.id] = new_state
+        updated_ids.add(op.id)
+        result.update(status="ok", id=op.id, transaction=_batch_transaction(op.id, new_state, current_user.id))
+
+    if creates:
+        # One multi-row INSERT. RETURNING order is not guaranteed without
+        # a sentinel column (SQLite falls back to a statement per row), so
+        # new ids are paired with their operations by the row values.
+        # Identical rows are interchangeable.
+        pending = defaultdict(list)
+        for result, state in creates:
+            pending[tuple(state[f] for f in _BATCH_FIELDS)].append((result, state))
+        inserted = await db.execute(
+            insert(models.Transaction).returning(
+                models.Transaction.id, *(getattr(models.Transaction, f) for f in _BATCH_FIELDS),
+            ),
+            [{**state, "user_id": current_user.id} for _, state in creates],
+        )
+        for row in inserted:
+            result, state = pending[tuple(getattr(row, f) for f in _BATCH_FIELDS)].pop(0)
+            result.update(id=row.id, transaction=_batch_transaction(row.id, state, current_user.id))
+
+    updated_ids -= deleted_ids
+    if updated_ids:
+        # Bulk UPDATE by primary key: one executemany.
+        await db.execute(update(models.Transaction), [
+            {"id": transaction_id, **states[transaction_id]} for transaction_id in sorted(updated_ids)
+        ])
+
+    if deleted_ids:
+        await db.execute(delete(models.Transaction).where(
+            models.Transaction.id.in_(deleted_ids),
+            models.Transaction.user_id == current_user.id,
+        ))
+
+    await apply_totals_delta(db, current_user.id, delta)
+    await db.commit()
+
+    applied = sum(1 for result in results if result["status"] == "ok")
+    if applied:
+        await invalidate_summaries(current_user.id, months)
+        await invalidate_collections(current_user.id, "transactions")
+
+    return {"applied": applied, "failed": len(results) - applied, "results": results}
+
+
+def _encode_cursor(transaction) -> str:
+    raw = f"{transaction.date.isoformat()}:{transaction.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[date, int]:
+    raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    date_str, id_str = raw.split(":")
+    return date.fromisoformat(date_str), int(id_str)
+
+
+def _encode_search_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode("utf-8")).decode("ascii")
+
+
+def _decode_search_cursor(cursor: str) -> int:
+    raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    prefix, offset = raw.split(":")
+    if prefix != "offset" or int(offset) < 0:
+        raise ValueError(cursor)
+    return int(offset)
+
+
+def _filter_transactions(query, current_user: Principal, category_id: Optional[int], month: Optional[str]):
+    query = query.where(models.Transaction.user_id == current_user.id)
 
     if category_id:
-        query = query.filter(models.Transaction.category_id == category_id)
+        query = query.where(models.Transaction.category_id == category_id)
 
     if month:
-        from sqlalchemy import extract
-        year, mo = month.split("-")
-        query = query.filter(
-            extract("year", models.Transaction.date) == int(year),
-            extract("month", models.Transaction.date) == int(mo),
+        try:
+            start, end = month_range(month)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Month must be in format YYYY-MM (e.g. 2026-02)",
+            )
+        query = query.where(
+            models.Transaction.date >= start,
+            models.Transaction.date < end,
         )
 
-    return query.order_by(models.Transaction.date.desc()).all()
+    return query
+
+
+@router.get("/", response_model=schemas.TransactionPage)
+async def get_transactions(
+    request: Request,
+    response: Response,
+    category_id: Optional[int] = Query(None),
+    month: Optional[str] = Query(None),
+    q: Optional[str] = Query(None, max_length=200, description="search descriptions, best match first"),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    # One version covers every filter and page: any write retires it.
+    etag = await collection_etag(current_user.id, "transactions")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    fast = settings.FAST_JSON_RESPONSES
+    if fast:
+        columns = response_columns(models.Transaction, schemas.TransactionResponse)
+    else:
+        columns = [models.Transaction]
+    query = _filter_transactions(select(*columns), current_user, category_id, month)
+
+    q = q.strip() if q else None
+    offset = 0
+    if q:
+        # Relevance gives no stable keyset, so search results page by offset.
+        if cursor:
+            try:
+                offset = _decode_search_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = search_transactions(query, db.get_bind().dialect.name, q).offset(offset)
+    elif cursor:
+        # Keyset pagination: continue strictly after the last row of the
+        # previous page, so every page costs the same regardless of depth.
+        try:
+            cursor_date, cursor_id = _decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = query.where(
+            or_(
+                models.Transaction.date < cursor_date,
+                and_(
+                    models.Transaction.date == cursor_date,
+                    models.Transaction.id < cursor_id,
+                ),
+            )
+        )
+
+    result = await db.execute(
+        query.order_by(models.Transaction.date.desc(), models.Transaction.id.desc())
+        .limit(limit + 1)
+    )
+    rows = result.all() if fast else result.scalars().all()
+
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_search_cursor(offset + limit) if q else _encode_cursor(items[-1])
+    if fast:
+        return with_etag(
+            FastJSONResponse({"items": row_dicts(items), "next_cursor": next_cursor}), response, etag,
+        )
+    return with_etag({"items": items, "next_cursor": next_cursor}, response, etag)
+
+
+@router.get("/export")
+async def export_transactions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    category_id: Optional[int] = Query(None),
+    month: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    query = _filter_transactions(
+        select(
+            models.Transaction.id,
+            models.Transaction.amount,
+            models.Transaction.description,
+            models.Transaction.date,
+            models.Transaction.category_id,
+        ),
+        current_user,
+        category_id,
+        month,
+    )
+
+    # yield_per streams rows through a server-side cursor, so they are
+    # fetched and written out in fixed-size chunks.
+    rows = await db.stream(
+        query.order_by(models.Transaction.date.desc(), models.Transaction.id.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    if format == "csv":
+        body, media_type = iter_export_csv(rows), "text/csv"
+    else:
+        body, media_type = iter_export_ndjson(rows), "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'},
+    )
 
 
 @router.get("/{transaction_id}", response_model=schemas.TransactionResponse)
-def get_transaction(
+async def get_transaction(
     transaction_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    transaction = db.query(models.Transaction).filter(
+    transaction = await db.scalar(select(models.Transaction).where(
         models.Transaction.id == transaction_id,
         models.Transaction.user_id == current_user.id,
-    ).first()
+    ))
 
     if not transaction:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found")
@@ -80,53 +484,71 @@ def get_transaction(
 
 
 @router.put("/{transaction_id}", response_model=schemas.TransactionResponse)
-def update_transaction(
+async def update_transaction(
     transaction_id: int,
     transaction_data: schemas.TransactionUpdate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    transaction = db.query(models.Transaction).filter(
+    update_fields = transaction_data.model_dump(exclude_unset=True)
+    nulled = _nulled_required_field(update_fields)
+    if nulled:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=f"{nulled} cannot be null")
+
+    # Locked until commit, so a concurrent edit cannot remove the same
+    # old amount from the totals twice. SQLite ignores FOR UPDATE.
+    transaction = await db.scalar(select(models.Transaction).where(
         models.Transaction.id == transaction_id,
         models.Transaction.user_id == current_user.id,
-    ).first()
+    ).with_for_update())
 
     if not transaction:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found")
 
     if transaction_data.category_id is not None:
-        category = db.query(models.Category).filter(
+        category = await db.scalar(select(models.Category).where(
             models.Category.id == transaction_data.category_id,
             models.Category.user_id == current_user.id,
-        ).first()
+        ))
         if not category:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
 
-    update_fields = transaction_data.model_dump(exclude_unset=True)
+    old_month = month_of(transaction.date)
+    delta = TotalsDelta()
+    delta.remove(transaction.category_id, transaction.date, transaction.amount_cents)
+
     for field, value in update_fields.items():
         setattr(transaction, field, value)
 
-    db.commit()
-    db.refresh(transaction)
-    delete_cache_pattern(f"summary:{current_user.id}:*")
+    delta.add(transaction.category_id, transaction.date, transaction.amount_cents)
+    await apply_totals_delta(db, current_user.id, delta)
+    await db.commit()
+    await db.refresh(transaction)
+    await invalidate_summaries(current_user.id, [old_month, month_of(transaction.date)])
+    await invalidate_collections(current_user.id, "transactions")
     return transaction
 
 
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_transaction(
+async def delete_transaction(
     transaction_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    transaction = db.query(models.Transaction).filter(
+    # Locked for the same reason as in update_transaction.
+    transaction = await db.scalar(select(models.Transaction).where(
         models.Transaction.id == transaction_id,
         models.Transaction.user_id == current_user.id,
-    ).first()
+    ).with_for_update())
 
     if not transaction:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found")
 
-    db.delete(transaction)
-    db.commit()
-    delete_cache_pattern(f"summary:{current_user.id}:*")
+    delta = TotalsDelta()
+    delta.remove(transaction.category_id, transaction.date, transaction.amount_cents)
+    await db.delete(transaction)
+    await apply_totals_delta(db, current_user.id, delta)
+    await db.commit()
+    await invalidate_summaries(current_user.id, [month_of(transaction.date)])
+    await invalidate_collections(current_user.id, "transactions")
     return None
\ No newline at end of file
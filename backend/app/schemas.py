@@ -1,6 +1,14 @@
-from pydantic import BaseModel, EmailStr
+import datetime
+from pydantic import BaseModel, EmailStr, Field
 from datetime import date
-from typing import Optional
+from typing import Annotated, List, Literal, Optional, Union
+
+# Most operations one POST /transactions/batch may carry.
+MAX_BATCH_OPERATIONS = 500
+
+# Amounts are stored as BIGINT cents, so they must be finite and fit.
+MAX_AMOUNT = (2**63 - 1) // 100
+Amount = Annotated[float, Field(allow_inf_nan=False, ge=-MAX_AMOUNT, le=MAX_AMOUNT)]
 
 
 class UserCreate(BaseModel):
@@ -43,7 +51,7 @@ class CategoryResponse(CategoryBase):
 
 
 class TransactionBase(BaseModel):
-    amount: float
+    amount: Amount
     description: Optional[str] = None
     date: date
     category_id: int
@@ -54,9 +62,11 @@ class TransactionCreate(TransactionBase):
 
 
 class TransactionUpdate(BaseModel):
-    amount: Optional[float] = None
+    amount: Optional[Amount] = None
     description: Optional[str] = None
-    date: Optional[date] = None
+    # Spelled datetime.date: the default below rebinds the name `date`
+    # in the class body before this annotation is evaluated.
+    date: Optional[datetime.date] = None
     category_id: Optional[int] = None
 
 
@@ -68,9 +78,63 @@ class TransactionResponse(TransactionBase):
         from_attributes = True
 
 
+class TransactionPage(BaseModel):
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None
+
+
+class TransactionImportError(BaseModel):
+    row: int
+    error: str
+
+
+class TransactionImportResult(BaseModel):
+    imported: int
+    errors: List[TransactionImportError]
+
+
+class TransactionBatchCreate(TransactionCreate):
+    op: Literal["create"]
+
+
+class TransactionBatchUpdate(TransactionUpdate):
+    op: Literal["update"]
+    id: int
+
+
+class TransactionBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+
+TransactionBatchOperation = Annotated[
+    Union[TransactionBatchCreate, TransactionBatchUpdate, TransactionBatchDelete],
+    Field(discriminator="op"),
+]
+
+
+class TransactionBatch(BaseModel):
+    operations: List[TransactionBatchOperation] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class TransactionBatchOperationResult(BaseModel):
+    index: int
+    op: str
+    status: Literal["ok", "error"]
+    id: Optional[int] = None
+    transaction: Optional[TransactionResponse] = None
+    error: Optional[str] = None
+
+
+class TransactionBatchResult(BaseModel):
+    applied: int
+    failed: int
+    results: List[TransactionBatchOperationResult]
+
+
 class BudgetBase(BaseModel):
     month: str
-    limit_amount: float
+    limit_amount: Amount
     category_id: int
 
 
@@ -83,4 +147,17 @@ class BudgetResponse(BudgetBase):
     user_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class BudgetAlertResponse(BaseModel):
+    id: int
+    month: str
+    severity: str
+    spent: float
+    limit_amount: float
+    category_id: int
+    category_name: str
+    created_at: datetime.datetime
+    escalated_at: datetime.datetime
+    updated_at: datetime.datetime
@@ -0,0 +1,48 @@
+"""
+Search over transaction descriptions, ranked best match first.
+
+On PostgreSQL a query is a case-insensitive substring match (ILIKE),
+served by the GIN index on (user_id, description gin_trgm_ops), so only
+the user's own matches are visited, and ranked by trigram similarity. On
+SQLite it is a phrase match against transactions_fts, whose trigram
+tokenizer also matches substrings, ranked by bm25. Either way, queries
+shorter than three characters have no trigrams to look up and fall back
+to scanning the user's transactions.
+"""
+from sqlalchemy import column, func, table
+
+from app import models
+
+# Shortest query a trigram index can serve.
+MIN_INDEXED_QUERY_LENGTH = 3
+
+_fts = table("transactions_fts", column("rowid"), column("rank"), column("transactions_fts"))
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_phrase(q: str) -> str:
+    # A quoted phrase, so FTS5 query syntax in q is matched literally.
+    return '"' + q.replace('"', '""') + '"'
+
+
+def search_transactions(query, dialect_name: str, q: str):
+    """
+    Restricts a select over transactions to rows whose description
+    contains q, ordered by relevance. Add a tiebreak ordering after it
+    for stable pages.
+    """
+    if dialect_name == "sqlite" and len(q) >= MIN_INDEXED_QUERY_LENGTH:
+        return (
+            query.join(_fts, _fts.c.rowid == models.Transaction.id)
+            .where(_fts.c.transactions_fts.match(_fts_phrase(q)))
+            .order_by(_fts.c.rank)
+        )
+
+    query = query.where(models.Transaction.description.ilike(_like_pattern(q), escape="\\"))
+    if dialect_name == "postgresql":
+        query = query.order_by(func.similarity(models.Transaction.description, q).desc())
+    return query
@@ -0,0 +1,48 @@
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+
+def month_range(month: str) -> tuple[date, date]:
+    """
+    Turns a "YYYY-MM" string into a half-open date range:
+    the first day of the month and the first day of the next month.
+    Filtering with date >= start AND date < end lets the database
+    use an index range scan, which extract("year"/"month") cannot.
+    Raises ValueError if the month is malformed.
+    """
+    year, mo = month.split("-")
+    start = date(int(year), int(mo), 1)
+    if start.month == 12:
+        end = date(start.year + 1, 1, 1)
+    else:
+        end = date(start.year, start.month + 1, 1)
+    return start, end
+
+
+def month_of(d: date) -> str:
+    """The "YYYY-MM" month a date falls in."""
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def months_between(first: date, last: date) -> list[str]:
+    """Every "YYYY-MM" month from first to last, inclusive."""
+    months = []
+    year, mo = first.year, first.month
+    while (year, mo) <= (last.year, last.month):
+        months.append(f"{year:04d}-{mo:02d}")
+        year, mo = (year + 1, 1) if mo == 12 else (year, mo + 1)
+    return months
+
+
+def to_cents(amount: float | Decimal | str) -> int:
+    """
+    Converts a decimal amount to integer cents, rounding half away
+    from zero. Goes through the amount's shortest decimal form, so
+    19.99 becomes 1999 rather than 1998.
+    """
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> float:
+    """Converts integer cents back to the decimal amount the API returns."""
+    return cents / 100
@@ -0,0 +1,184 @@
+"""
+Drives the API with concurrent clients and reports latency percentiles
+and throughput per endpoint. Expects users created by benchmarks.seed:
+
+    python -m benchmarks.seed --users 100 --create-tables
+    python -m benchmarks.load --users 100 --output results.json
+
+By default the app runs in this process through httpx's ASGI transport,
+against DATABASE_URL. Pass --base-url to measure a running server
+instead, e.g. uvicorn with several workers.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import subprocess
+import time
+from contextlib import AsyncExitStack
+from datetime import date, datetime, timezone
+
+import httpx
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.utils import month_of
+from benchmarks.seed import SEED_PASSWORD, email_for
+
+SCENARIOS = ("login", "transactions", "transactions_search", "summary_monthly", "summary_alerts")
+
+# Matches a sizeable share of seeded descriptions ("Supermarket", "Farmers market").
+SEARCH_QUERY = "market"
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _request(scenario: str, email: str, token: str, month: str) -> tuple[str, str, dict]:
+    headers = {"Authorization": f"Bearer {token}"}
+    if scenario == "login":
+        return "POST", "/auth/login", {"json": {"email": email, "password": SEED_PASSWORD}}
+    if scenario == "transactions":
+        return "GET", "/transactions/", {"params": {"limit": 50}, "headers": headers}
+    if scenario == "transactions_search":
+        return "GET", "/transactions/", {"params": {"q": SEARCH_QUERY, "limit": 50}, "headers": headers}
+    if scenario == "summary_monthly":
+        return "GET", f"/summary/monthly/{month}", {"headers": headers}
+    return "GET", f"/summary/alerts/{month}", {"headers": headers}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: str,
+    accounts: list[tuple[str, str]],
+    month: str,
+    concurrency: int,
+    duration: float,
+) -> dict:
+    latencies = []
+    errors = 0
+    next_account = itertools.cycle(accounts)
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            email, token = next(next_account)
+            method, url, kwargs = _request(scenario, email, token, month)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        },
+    }
+
+
+async def log_in(client: httpx.AsyncClient, users: int) -> list[tuple[str, str]]:
+    accounts = []
+    for index in range(users):
+        email = email_for(index)
+        response = await client.post("/auth/login", json={"email": email, "password": SEED_PASSWORD})
+        response.raise_for_status()
+        accounts.append((email, response.json()["access_token"]))
+    return accounts
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    async with AsyncExitStack() as stack:
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+            target = args.base_url
+        else:
+            from app.main import app
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=30)
+            target = "in-process"
+        await stack.enter_async_context(client)
+
+        accounts = await log_in(client, args.users)
+        results = {}
+        for scenario in args.scenarios:
+            print(f"{scenario}: {args.concurrency} clients for {args.duration:g}s")
+            results[scenario] = await run_scenario(
+                client, scenario, accounts, args.month, args.concurrency, args.duration,
+            )
+            latency = results[scenario]["latency_ms"]
+            print(
+                f"  {results[scenario]['requests']} requests, {results[scenario]['errors']} errors, "
+                f"{results[scenario]['throughput_rps']} req/s, "
+                f"p50 {latency['p50']}ms p95 {latency['p95']}ms p99 {latency['p99']}ms"
+            )
+
+    return {
+        "started_at": started_at,
+        "commit": _git_commit(),
+        "target": target,
+        "database": None if args.base_url else make_url(settings.DATABASE_URL).get_backend_name(),
+        "python": platform.python_version(),
+        "config": {
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "month": args.month,
+        },
+        "scenarios": results,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10, help="seeded users to spread requests over")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--month", default=month_of(date.today()), help="month for the summary endpoints")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--base-url", default=None, help="measure a running server instead of the in-process app")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Fills the database at DATABASE_URL with synthetic users, categories,
+budgets and transactions for load testing:
+
+    python -m benchmarks.seed --users 1000 --transactions-per-user 2000
+
+Every user is loadtest<N>@example.com with the password in
+SEED_PASSWORD. Rows are written with bulk inserts, a chunk of users at a
+time, and monthly_category_totals is rebuilt at the end.
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert, select
+
+from app import models
+from app.aggregates import rebuild_totals
+from app.auth import hash_password
+from app.database import Base, SessionLocal, engine
+from app.utils import month_of, month_range, months_between
+
+SEED_PASSWORD = "loadtest-password"
+USER_CHUNK_SIZE = 200
+TRANSACTION_BATCH_SIZE = 10000
+
+# name -> (type, share of transactions, smallest and largest amount in cents)
+CATEGORIES = {
+    "Salary": ("income", 0.02, 250000, 600000),
+    "Freelance": ("income", 0.02, 20000, 150000),
+    "Rent": ("expense", 0.02, 90000, 220000),
+    "Utilities": ("expense", 0.04, 3000, 25000),
+    "Groceries": ("expense", 0.30, 500, 18000),
+    "Dining": ("expense", 0.20, 800, 9000),
+    "Transport": ("expense", 0.16, 250, 6000),
+    "Entertainment": ("expense", 0.10, 500, 12000),
+    "Health": ("expense", 0.04, 1500, 30000),
+    "Shopping": ("expense", 0.10, 1000, 40000),
+}
+
+DESCRIPTIONS = {
+    "Salary": ["Monthly salary"],
+    "Freelance": ["Client invoice", "Consulting", "Design work"],
+    "Rent": ["Rent"],
+    "Utilities": ["Electricity", "Water", "Internet", "Phone"],
+    "Groceries": ["Supermarket", "Farmers market", "Corner shop", None],
+    "Dining": ["Lunch", "Dinner out", "Coffee", "Takeaway", None],
+    "Transport": ["Bus pass", "Fuel", "Taxi", "Train ticket", None],
+    "Entertainment": ["Cinema", "Concert", "Streaming", "Books", None],
+    "Health": ["Pharmacy", "Dentist", "Gym"],
+    "Shopping": ["Clothes", "Electronics", "Home goods", None],
+}
+
+
+def email_for(index: int) -> str:
+    return f"loadtest{index}@example.com"
+
+
+def _expected_monthly_cents(name: str, transactions_per_month: float) -> int:
+    _, share, low, high = CATEGORIES[name]
+    return int(transactions_per_month * share * (low + high) / 2)
+
+
+def seed(
+    users: int,
+    transactions_per_user: int,
+    months: list[str],
+    rng: random.Random,
+    log=print,
+) -> dict:
+    hashed_password = hash_password(SEED_PASSWORD)
+    first_day = month_range(months[0])[0]
+    days = (month_range(months[-1])[1] - first_day).days
+    names = list(CATEGORIES)
+    weights = [CATEGORIES[name][1] for name in names]
+    per_month = transactions_per_user / len(months)
+    counts = {"users": 0, "categories": 0, "budgets": 0, "transactions": 0}
+
+    with SessionLocal() as db:
+        for chunk_start in range(0, users, USER_CHUNK_SIZE):
+            emails = [email_for(i) for i in range(chunk_start, min(users, chunk_start + USER_CHUNK_SIZE))]
+            db.execute(insert(models.User), [
+                {"email": email, "hashed_password": hashed_password} for email in emails
+            ])
+            user_ids = db.scalars(select(models.User.id).where(models.User.email.in_(emails))).all()
+
+            db.execute(insert(models.Category), [
+                {"name": name, "type": CATEGORIES[name][0], "user_id": user_id}
+                for user_id in user_ids
+                for name in names
+            ])
+            category_ids = {
+                (user_id, name): category_id
+                for category_id, user_id, name in db.execute(
+                    select(models.Category.id, models.Category.user_id, models.Category.name)
+                    .where(models.Category.user_id.in_(user_ids))
+                )
+            }
+
+            # Limits around expected spending, so some budgets end up over.
+            budgets = [
+                {
+                    "month": month,
+                    "limit_cents": int(_expected_monthly_cents(name, per_month) * rng.uniform(0.7, 1.5)),
+                    "category_id": category_ids[(user_id, name)],
+                    "user_id": user_id,
+                }
+                for user_id in user_ids
+                for name in names
+                if CATEGORIES[name][0] == "expense"
+                for month in months
+            ]
+            db.execute(insert(models.Budget), budgets)
+
+            batch = []
+            for user_id in user_ids:
+                for name in rng.choices(names, weights, k=transactions_per_user):
+                    _, _, low, high = CATEGORIES[name]
+                    batch.append({
+                        "amount_cents": rng.randint(low, high),
+                        "description": rng.choice(DESCRIPTIONS[name]),
+                        "date": first_day + timedelta(days=rng.randrange(days)),
+                        "category_id": category_ids[(user_id, name)],
+                        "user_id": user_id,
+                    })
+                    if len(batch) == TRANSACTION_BATCH_SIZE:
+                        db.execute(insert(models.Transaction), batch)
+                        counts["transactions"] += len(batch)
+                        batch = []
+            if batch:
+                db.execute(insert(models.Transaction), batch)
+                counts["transactions"] += len(batch)
+            db.commit()
+
+            counts["users"] += len(user_ids)
+            counts["categories"] += len(category_ids)
+            counts["budgets"] += len(budgets)
+            log(f"  {counts['users']}/{users} users, {counts['transactions']} transactions")
+
+        log("Rebuilding monthly_category_totals")
+        rebuild_totals(db)
+
+    return counts
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.seed", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--transactions-per-user", type=int, default=1000)
+    parser.add_argument("--months", type=int, default=12, help="how many months of history, ending with --end-month")
+    parser.add_argument("--end-month", default=month_of(date.today()), help="YYYY-MM, defaults to the current month")
+    parser.add_argument("--seed", type=int, default=0, help="random seed, for repeatable data")
+    parser.add_argument("--create-tables", action="store_true", help="create missing tables first (handy on SQLite)")
+    args = parser.parse_args(argv)
+
+    if args.create_tables:
+        Base.metadata.create_all(engine)
+
+    end, _ = month_range(args.end_month)
+    start = end
+    for _ in range(args.months - 1):
+        start = (start - timedelta(days=1)).replace(day=1)
+
+    started = time.perf_counter()
+    counts = seed(args.users, args.transactions_per_user, months_between(start, end), random.Random(args.seed))
+    elapsed = time.perf_counter() - started
+    print(
+        "Seeded {users} users, {categories} categories, {budgets} budgets and "
+        "{transactions} transactions".format(**counts)
+        + f" in {elapsed:.1f}s ({counts['transactions'] / elapsed:.0f} transactions/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Compares the default response path for transaction lists with the
+FAST_JSON_RESPONSES path:
+
+  default   ORM objects, validated through TransactionResponse and encoded
+            with json, as FastAPI does for a response_model
+  fast      selected columns encoded with orjson in one call
+  streamed  selected columns encoded with iter_json_array
+
+Rows come from an in-memory SQLite database, so fetch times are included.
+
+    python -m benchmarks.serialization [--rows 1000 10000 100000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.database import Base
+from app.responses import iter_json_array, response_columns, row_dicts
+
+transaction_list = TypeAdapter(list[schemas.TransactionResponse])
+
+
+def seed(session: Session, count: int):
+    user = models.User(email="bench@example.com", hashed_password="x")
+    session.add(user)
+    session.flush()
+    category = models.Category(name="Food", type="expense", user_id=user.id)
+    session.add(category)
+    session.flush()
+    start = date(2020, 1, 1)
+    session.execute(insert(models.Transaction), [
+        {
+            "amount_cents": 100 + (i % 500) * 37,
+            "description": f"Transaction {i}",
+            "date": start + timedelta(days=i % 2000),
+            "category_id": category.id,
+            "user_id": user.id,
+        }
+        for i in range(count)
+    ])
+    session.commit()
+
+
+def default_path(session: Session) -> bytes:
+    objects = session.scalars(select(models.Transaction)).all()
+    content = transaction_list.dump_python(transaction_list.validate_python(objects), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _columns():
+    return select(*response_columns(models.Transaction, schemas.TransactionResponse))
+
+
+def fast_path(session: Session) -> bytes:
+    return orjson.dumps(row_dicts(session.execute(_columns()).all()))
+
+
+def streamed_path(session: Session) -> bytes:
+    async def rows():
+        for row in session.execute(_columns()):
+            yield row
+
+    async def collect():
+        return b"".join([chunk async for chunk in iter_json_array(rows())])
+
+    return asyncio.run(collect())
+
+
+PATHS = {"default": default_path, "fast": fast_path, "streamed": streamed_path}
+
+
+def measure(path, session: Session, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        session.expunge_all()
+        started = time.perf_counter()
+        path(session)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>8}  " + "  ".join(f"{name:>10}" for name in PATHS) + "  speedup")
+    for count in args.rows:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            seed(session, count)
+            assert json.loads(fast_path(session)) == json.loads(default_path(session))
+            results = {name: measure(path, session, args.repeat) for name, path in PATHS.items()}
+        engine.dispose()
+
+        speedup = results["default"] / results["fast"]
+        print(
+            f"{count:>8}  "
+            + "  ".join(f"{results[name] * 1000:>8.1f}ms" for name in PATHS)
+            + f"  {speedup:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
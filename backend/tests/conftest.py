@@ -1,18 +1,37 @@
+import os
+from contextlib import contextmanager
+
+# Cheap password hashes keep the suite fast; set before the app reads settings.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import fakeredis
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.instrumentation import capture_requests
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, enforce_sqlite_foreign_keys, get_db, to_async_url
 from app.auth import hash_password
-from app import models
+from app import cache, models
 
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
 
-engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = enforce_sqlite_foreign_keys(
+    create_engine(SQLALCHEMY_TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The API runs on the asyncio engine. Every TestClient has its own event loop,
+# so connections must not be pooled across tests.
+async_engine = enforce_sqlite_foreign_keys(
+    create_async_engine(to_async_url(SQLALCHEMY_TEST_DATABASE_URL), poolclass=NullPool)
+)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -25,13 +44,19 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="function")
+def fake_redis(monkeypatch):
+    """Backs the cache layer with an in-memory Redis. Request before `client`."""
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(cache, "redis_client", client)
+    return client
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
 
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as c:
@@ -78,10 +103,56 @@ def test_category(db_session, test_user):
 def test_income_category(db_session, test_user):
     category = models.Category(
         name="Salary",
-        type="inc
+        type="income",
         user_id=test_user.id,
     )
     db_session.add(category)
     db_session.commit()
     db_session.refresh(category)
-    return category
\ No newline at end of file
+    return category
+
+
+@pytest.fixture
+def create_transaction(client, auth_headers):
+    """
+    Creates a transaction for test_user through the API and returns its id:
+
+        transaction_id = create_transaction(test_category.id, 25.50, date="2026-03-02")
+    """
+    def create(category_id: int, amount: float = 10.00, description: str | None = "Groceries", date="2026-02-07"):
+        response = client.post("/transactions/", json={
+            "amount": amount,
+            "description": description,
+            "date": date,
+            "category_id": category_id,
+        }, headers=auth_headers)
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    return create
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Asserts that every request made inside the block runs at most
+    `queries` SQL statements (and `redis_calls` Redis calls, if given):
+
+        with query_budget(1):
+            client.get("/summary/monthly/2026-02", headers=auth_headers)
+    """
+    @contextmanager
+    def budget(queries: int, redis_calls: int | None = None):
+        with capture_requests() as requests:
+            yield requests
+        assert requests, "no requests were made inside the query budget"
+        for stats in requests:
+            assert stats.db_queries <= queries, (
+                f"{stats.method} {stats.path} ran {stats.db_queries} queries, budget is {queries}"
+            )
+            if redis_calls is not None:
+                assert stats.redis_calls <= redis_calls, (
+                    f"{stats.method} {stats.path} made {stats.redis_calls} Redis calls, budget is {redis_calls}"
+                )
+
+    return budget
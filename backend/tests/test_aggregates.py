@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+from datetime import date
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app import models
+from app.aggregates import rebuild_totals, verify_totals
+
+
+def _totals(db_session):
+    db_session.expire_all()
+    return {
+        (t.category_id, t.month): (t.total_cents, t.transaction_count)
+        for t in db_session.query(models.MonthlyCategoryTotal).all()
+    }
+
+
+def test_totals_follow_transaction_writes(client, db_session, auth_headers, test_category, test_income_category):
+    first = client.post("/transactions/", json={
+        "amount": 20.00,
+        "date": "2026-02-07",
+        "category_id": test_category.id,
+    }, headers=auth_headers).json()
+    client.post("/transactions/", json={
+        "amount": 5.00,
+        "date": "2026-02-10",
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+
+    assert _totals(db_session) == {(test_category.id, "2026-02"): (2500, 2)}
+
+    # Moving a transaction to another month and category shifts both totals.
+    client.put(f"/transactions/{first['id']}", json={
+        "amount": 30.00,
+        "date": "2026-03-01",
+        "category_id": test_income_category.id,
+    }, headers=auth_headers)
+
+    assert _totals(db_session) == {
+        (test_category.id, "2026-02"): (500, 1),
+        (test_income_category.id, "2026-03"): (3000, 1),
+    }
+
+    client.delete(f"/transactions/{first['id']}", headers=auth_headers)
+
+    totals = _totals(db_session)
+    assert totals[(test_category.id, "2026-02")] == (500, 1)
+    assert totals[(test_income_category.id, "2026-03")] == (0, 0)
+    assert verify_totals(db_session) == []
+
+
+@contextmanager
+def _transaction_reads():
+    """Collects each ORM select of transactions, as PostgreSQL would run it."""
+    reads = []
+
+    def record(state):
+        if state.is_select and models.Transaction.__table__ in state.statement.get_final_froms():
+            reads.append(str(state.statement.compile(dialect=postgresql.dialect())))
+
+    event.listen(Session, "do_orm_execute", record)
+    try:
+        yield reads
+    finally:
+        event.remove(Session, "do_orm_execute", record)
+
+
+def test_totals_delta_comes_from_locked_row(client, db_session, auth_headers, test_category, create_transaction):
+    transaction_id = create_transaction(test_category.id, 20.00)
+
+    # The read the old values come from locks the row, so two concurrent
+    # edits cannot both remove the same old amount from the totals. (The
+    # second read is the refresh after commit.)
+    with _transaction_reads() as reads:
+        client.put(f"/transactions/{transaction_id}", json={"amount": 30.00}, headers=auth_headers)
+    assert reads[0].endswith("FOR UPDATE")
+
+    with _transaction_reads() as reads:
+        client.post("/transactions/batch", json={"operations": [
+            {"op": "update", "id": transaction_id, "amount": 40.00},
+        ]}, headers=auth_headers)
+    assert reads[0].endswith("FOR UPDATE")
+
+    with _transaction_reads() as reads:
+        client.delete(f"/transactions/{transaction_id}", headers=auth_headers)
+    assert len(reads) == 1 and reads[0].endswith("FOR UPDATE")
+
+    assert _totals(db_session) == {(test_category.id, "2026-02"): (0, 0)}
+    assert verify_totals(db_session) == []
+
+
+def test_totals_follow_import(client, db_session, auth_headers, test_category):
+    body = (
+        "amount,description,date,category_id\n"
+        f"10.00,A,2026-02-01,{test_category.id}\n"
+        f"2.50,B,2026-02-15,{test_category.id}\n"
+        f"7.00,C,2026-04-03,{test_category.id}\n"
+    )
+    client.post(
+        "/transactions/import",
+        files={"file": ("transactions.csv", body, "text/csv")},
+        headers=auth_headers,
+    )
+
+    assert _totals(db_session) == {
+        (test_category.id, "2026-02"): (1250, 2),
+        (test_category.id, "2026-04"): (700, 1),
+    }
+
+
+def test_verify_and_rebuild_repair_drift(db_session, test_user, test_category):
+    db_session.add_all([
+        models.Transaction(amount=12.0, date=date(2026, 2, 3), category_id=test_category.id, user_id=test_user.id),
+        models.Transaction(amount=8.0, date=date(2026, 2, 9), category_id=test_category.id, user_id=test_user.id),
+        models.MonthlyCategoryTotal(
+            user_id=test_user.id, category_id=test_category.id, month="2026-05",
+            total_cents=9900, transaction_count=3,
+        ),
+    ])
+    db_session.commit()
+
+    drift = {(d["month"], d["stored_count"], d["expected_count"]) for d in verify_totals(db_session)}
+    assert drift == {("2026-02", 0, 2), ("2026-05", 3, 0)}
+
+    rebuild_totals(db_session, test_user.id)
+
+    assert verify_totals(db_session) == []
+    assert _totals(db_session) == {(test_category.id, "2026-02"): (2000, 2)}
+
+
+def test_summary_reads_totals(client, db_session, auth_headers, test_user, test_category):
+    # A totals row with no matching transactions proves the summary no
+    # longer scans transactions.
+    db_session.add(models.MonthlyCategoryTotal(
+        user_id=test_user.id, category_id=test_category.id, month="2026-06",
+        total_cents=4200, transaction_count=1,
+    ))
+    db_session.commit()
+
+    response = client.get("/summary/monthly/2026-06", headers=auth_headers)
+
+    assert response.json()["total_spent"] == 42.0
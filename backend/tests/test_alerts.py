@@ -0,0 +1,118 @@
+from app import models
+from app.alerts import scan_alerts
+from app.utils import to_cents
+
+
+def _add_budget(db_session, user_id, category_id, limit_amount, spent, month="2026-02"):
+    db_session.add(models.Budget(month=month, limit_amount=limit_amount, category_id=category_id, user_id=user_id))
+    if spent:
+        db_session.add(models.MonthlyCategoryTotal(
+            user_id=user_id, category_id=category_id, month=month,
+            total_cents=to_cents(spent), transaction_count=1,
+        ))
+
+
+def _add_user(db_session, email, category_type="expense"):
+    user = models.User(email=email, hashed_password="x")
+    db_session.add(user)
+    db_session.flush()
+    category = models.Category(name="Rent", type=category_type, user_id=user.id)
+    db_session.add(category)
+    db_session.flush()
+    return user, category
+
+
+def _alerts(db_session):
+    db_session.expire_all()
+    return {
+        (a.user_id, a.category_id): a.severity
+        for a in db_session.query(models.BudgetAlert).filter_by(month="2026-02")
+    }
+
+
+def test_scan_records_alerts_across_users(db_session, test_user, test_category):
+    _add_budget(db_session, test_user.id, test_category.id, 100.0, 85.0)
+    other, other_category = _add_user(db_session, "other@example.com")
+    _add_budget(db_session, other.id, other_category.id, 100.0, 150.0)
+    calm, calm_category = _add_user(db_session, "calm@example.com")
+    _add_budget(db_session, calm.id, calm_category.id, 100.0, 10.0)
+    earner, income_category = _add_user(db_session, "earner@example.com", category_type="income")
+    _add_budget(db_session, earner.id, income_category.id, 100.0, 500.0)
+    db_session.commit()
+
+    # A batch size of one walks the users one at a time.
+    result = scan_alerts(db_session, "2026-02", batch_size=1)
+
+    assert result["users"] == 4
+    assert result["new_alerts"] == 2
+    assert _alerts(db_session) == {
+        (test_user.id, test_category.id): "warning",
+        (other.id, other_category.id): "high",
+    }
+
+
+def test_rescan_updates_and_removes_alerts(db_session, test_user, test_category):
+    _add_budget(db_session, test_user.id, test_category.id, 100.0, 85.0)
+    other, other_category = _add_user(db_session, "other@example.com")
+    _add_budget(db_session, other.id, other_category.id, 100.0, 150.0)
+    db_session.commit()
+    scan_alerts(db_session, "2026-02")
+
+    total = db_session.get(models.MonthlyCategoryTotal, (test_user.id, test_category.id, "2026-02"))
+    total.total_cents = 12000
+    db_session.query(models.MonthlyCategoryTotal).filter_by(user_id=other.id).delete()
+    db_session.commit()
+
+    result = scan_alerts(db_session, "2026-02")
+
+    assert result["new_alerts"] == 0
+    assert result["escalated_alerts"] == 1
+    assert result["removed_alerts"] == 1
+    assert _alerts(db_session) == {(test_user.id, test_category.id): "high"}
+
+
+def test_scan_reports_warning_escalating_to_high(db_session, test_user, test_category):
+    _add_budget(db_session, test_user.id, test_category.id, 100.0, 85.0)
+    db_session.commit()
+    assert scan_alerts(db_session, "2026-02")["new_alerts"] == 1
+    warned = db_session.query(models.BudgetAlert).one()
+    created_at, warned_at = warned.created_at, warned.escalated_at
+
+    total = db_session.get(models.MonthlyCategoryTotal, (test_user.id, test_category.id, "2026-02"))
+    total.total_cents = 10000
+    db_session.commit()
+
+    result = scan_alerts(db_session, "2026-02")
+
+    assert (result["new_alerts"], result["escalated_alerts"]) == (0, 1)
+    db_session.expire_all()
+    alert = db_session.query(models.BudgetAlert).one()
+    assert alert.severity == "high"
+    assert alert.created_at == created_at
+    assert alert.escalated_at > warned_at
+
+    # Staying high, or spending more, is not a second escalation.
+    total.total_cents = 11000
+    db_session.commit()
+    result = scan_alerts(db_session, "2026-02")
+    assert (result["new_alerts"], result["escalated_alerts"]) == (0, 0)
+
+
+def test_get_alerts(client, db_session, auth_headers, test_user, test_category):
+    _add_budget(db_session, test_user.id, test_category.id, 100.0, 150.0)
+    other, other_category = _add_user(db_session, "other@example.com")
+    _add_budget(db_session, other.id, other_category.id, 100.0, 150.0)
+    db_session.commit()
+    scan_alerts(db_session, "2026-02")
+
+    response = client.get("/alerts/?month=2026-02", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["category_name"] == "Food"
+    assert data[0]["severity"] == "high"
+    assert data[0]["spent"] == 150.0
+
+    assert client.get("/alerts/?month=2026-03", headers=auth_headers).json() == []
+    assert client.get("/alerts/?month=March", headers=auth_headers).status_code == 400
@@ -0,0 +1,98 @@
+import json
+import time
+
+from app import cache
+from app.auth import needs_rehash
+from app.config import settings
+
+
+def test_register(client):
+    response = client.post("/auth/register", json={
+        "email": "new@example.com",
+        "password": "secret-password",
+    })
+
+    assert response.status_code == 201
+    assert response.json()["email"] == "new@example.com"
+
+
+def test_login_invalid_password(client, test_user):
+    response = client.post("/auth/login", json={
+        "email": "testuser@example.com",
+        "password": "wrong-password",
+    })
+
+    assert response.status_code == 401
+
+
+def test_cached_principal_skips_users_query(client, auth_headers, query_budget):
+    # Only the categories query: the principal was cached at login.
+    with query_budget(1):
+        response = client.get("/categories/", headers=auth_headers)
+
+    assert response.status_code == 200
+
+
+def test_principal_loaded_once_after_eviction(client, auth_headers, test_user, query_budget):
+    cache.principal_cache.delete(test_user.id)
+
+    with query_budget(2) as first:
+        client.get("/categories/", headers=auth_headers)
+    with query_budget(1):
+        client.get("/categories/", headers=auth_headers)
+
+    assert first[0].db_queries == 2
+
+
+def test_evict_principal_from_another_worker(fake_redis, client, auth_headers, test_user):
+    assert cache.principal_cache.get(test_user.id) is not None
+
+    message = json.dumps({"origin": "another-worker", "kind": "principal", "user_id": test_user.id})
+    deadline = time.monotonic() + 2
+    while cache.principal_cache.get(test_user.id) is not None:
+        assert time.monotonic() < deadline
+        client.portal.call(fake_redis.publish, cache.INVALIDATION_CHANNEL, message)
+        time.sleep(0.05)
+
+
+def test_deleted_user_rejected_after_eviction(client, auth_headers, db_session, test_user):
+    db_session.delete(test_user)
+    db_session.commit()
+    client.portal.call(cache.evict_principal, test_user.id)
+
+    response = client.get("/categories/", headers=auth_headers)
+
+    assert response.status_code == 401
+
+
+def test_login_rehashes_password_when_cost_changes(client, db_session, test_user, monkeypatch):
+    assert test_user.hashed_password.startswith(f"$2b$0{settings.BCRYPT_ROUNDS}$")
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", settings.BCRYPT_ROUNDS + 1)
+
+    response = client.post("/auth/login", json={
+        "email": "testuser@example.com",
+        "password": "testpassword123",
+    })
+
+    assert response.status_code == 200
+    db_session.refresh(test_user)
+    assert not needs_rehash(test_user.hashed_password)
+
+    response = client.post("/auth/login", json={
+        "email": "testuser@example.com",
+        "password": "testpassword123",
+    })
+    assert response.status_code == 200
+
+
+def test_login_rejected_when_hash_pool_is_full(client, test_user, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_POOL_SIZE", 0)
+    monkeypatch.setattr(settings, "BCRYPT_MAX_QUEUE", 0)
+
+    response = client.post("/auth/login", json={
+        "email": "testuser@example.com",
+        "password": "testpassword123",
+    })
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -107,4 +107,28 @@ def test_delete_budget(client, auth_headers, test_category):
 def test_budget_requires_auth(client):
     response = client.get("/budgets/")
 
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+
+def test_update_budget_to_duplicate_month(client, auth_headers, test_category):
+    client.post("/budgets/", json={
+        "month": "2026-02",
+        "limit_amount": 400.00,
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+
+    create_response = client.post("/budgets/", json={
+        "month": "2026-03",
+        "limit_amount": 400.00,
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+
+    budget_id = create_response.json()["id"]
+
+    response = client.put(f"/budgets/{budget_id}", json={
+        "month": "2026-02",
+        "limit_amount": 500.00,
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+
+    assert response.status_code == 400
@@ -0,0 +1,226 @@
+import json
+import time
+
+import fakeredis
+import pytest
+
+from app import cache
+from app.cache import LocalCache
+
+
+
+def test_summary_is_cached(fake_redis, client, auth_headers, test_category, create_transaction):
+    create_transaction(test_category.id, 25.50)
+
+    first = client.get("/summary/monthly/2026-02", headers=auth_headers).json()
+
+    keys = client.portal.call(fake_redis.keys, "summary:*")
+    assert len(keys) == 1
+
+    second = client.get("/summary/monthly/2026-02", headers=auth_headers).json()
+    assert first == second
+
+
+def test_cached_summary_holds_integer_cents(fake_redis, client, auth_headers, test_category, create_transaction):
+    create_transaction(test_category.id, 25.50)
+
+    response = client.get("/summary/monthly/2026-02", headers=auth_headers).json()
+
+    key = client.portal.call(fake_redis.keys, "summary:*")[0]
+    cached = json.loads(client.portal.call(fake_redis.get, key))
+    assert cached["total_spent"] == 2550
+    assert cached["categories"][0]["spent"] == 2550
+    assert response["total_spent"] == 25.50
+
+
+def test_transaction_write_invalidates_summary(
+    fake_redis, client, auth_headers, test_user, test_category, create_transaction
+):
+    create_transaction(test_category.id, 25.50)
+    assert client.get("/summary/monthly/2026-02", headers=auth_headers).json()["total_spent"] == 25.50
+
+    create_transaction(test_category.id, 10.00)
+
+    assert client.portal.call(fake_redis.get, f"summary_version:{test_user.id}:2026-02") is not None
+
+    assert client.get("/summary/monthly/2026-02", headers=auth_headers).json()["total_spent"] == 35.50
+
+
+def test_unpadded_month_shares_the_invalidated_entry(
+    fake_redis, client, auth_headers, test_category, create_transaction
+):
+    assert client.get("/summary/monthly/2026-2", headers=auth_headers).json()["total_spent"] == 0.0
+
+    create_transaction(test_category.id, 10.00)
+
+    data = client.get("/summary/monthly/2026-2", headers=auth_headers).json()
+    assert data["month"] == "2026-02"
+    assert data["total_spent"] == 10.00
+
+
+def test_summary_range_shares_monthly_cache_entries(
+    fake_redis, client, auth_headers, test_category, create_transaction
+):
+    create_transaction(test_category.id, 25.50)
+    monthly = client.get("/summary/monthly/2026-02", headers=auth_headers).json()
+
+    data = client.get("/summary/range?from=2026-01&to=2026-03", headers=auth_headers).json()
+
+    assert data["months"][1] == monthly
+    keys = client.portal.call(fake_redis.keys, "summary:*")
+    assert sorted(key.split(":")[3] for key in keys) == ["2026-01", "2026-02", "2026-03"]
+
+    # A write to one month only rebuilds that month.
+    create_transaction(test_category.id, 10.00, date="2026-03-02")
+    data = client.get("/summary/range?from=2026-01&to=2026-03", headers=auth_headers).json()
+    assert [m["total_spent"] for m in data["months"]] == [0, 25.50, 10.00]
+
+
+def test_transaction_write_keeps_other_months_cached(
+    fake_redis, client, auth_headers, test_category, create_transaction
+):
+    create_transaction(test_category.id, 25.50, date="2026-02-07")
+    client.get("/summary/monthly/2026-02", headers=auth_headers)
+    client.get("/summary/monthly/2026-03", headers=auth_headers)
+    february_keys = set(client.portal.call(fake_redis.keys, "summary:*:2026-02:*"))
+    march_keys = set(client.portal.call(fake_redis.keys, "summary:*:2026-03:*"))
+
+    create_transaction(test_category.id, 10.00, date="2019-06-01")
+    client.get("/summary/monthly/2026-02", headers=auth_headers)
+    client.get("/summary/monthly/2026-03", headers=auth_headers)
+
+    # No new entries were built: both months were served from the cache.
+    assert set(client.portal.call(fake_redis.keys, "summary:*:2026-02:*")) == february_keys
+    assert set(client.portal.call(fake_redis.keys, "summary:*:2026-03:*")) == march_keys
+
+
+def test_transaction_date_change_invalidates_both_months(
+    fake_redis, client, auth_headers, test_category, create_transaction
+):
+    transaction_id = create_transaction(test_category.id, 25.50, date="2026-02-07")
+    assert client.get("/summary/monthly/2026-02", headers=auth_headers).json()["total_spent"] == 25.50
+    assert client.get("/summary/monthly/2026-03", headers=auth_headers).json()["total_spent"] == 0
+
+    client.put(f"/transactions/{transaction_id}", json={"date": "2026-03-02"}, headers=auth_headers)
+
+    assert client.get("/summary/monthly/2026-02", headers=auth_headers).json()["total_spent"] == 0
+    assert client.get("/summary/monthly/2026-03", headers=auth_headers).json()["total_spent"] == 25.50
+
+
+def test_budget_write_invalidates_its_month(fake_redis, client, auth_headers, test_category):
+    summary = client.get("/summary/monthly/2026-02", headers=auth_headers).json()
+    assert summary["total_budget_limit"] == 0
+
+    client.post("/budgets/", json={
+        "month": "2026-02",
+        "limit_amount": 400.00,
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+
+    summary = client.get("/summary/monthly/2026-02", headers=auth_headers).json()
+    assert summary["total_budget_limit"] == 400.00
+
+
+def test_local_cache_evicts_least_recently_used():
+    local = LocalCache(max_entries=2, ttl=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)
+
+    assert local.get("a") == 1
+    assert local.get("b") is None
+    assert local.get("c") == 3
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    local = LocalCache(max_entries=10, ttl=30)
+    now = time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    local.set("a", 1)
+
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now + 31)
+
+    assert local.get("a") is None
+    assert len(local) == 0
+
+
+def test_local_cache_invalidation_is_per_scope():
+    local = LocalCache(max_entries=2, ttl=60, scope=lambda key: key[0])
+    generation = local.generation
+
+    local.delete((2, "2026-02"))
+    assert not local.invalidated_since((1, "2026-02"), generation)
+
+    local.delete_scope(1)
+    assert local.invalidated_since((1, "2026-03"), generation)
+
+    # Scopes beyond max_entries are forgotten, and then count as invalidated.
+    generation = local.generation
+    for user_id in (3, 4, 5):
+        local.delete((user_id, "2026-02"))
+    assert local.invalidated_since((7, "2026-02"), generation)
+
+    local.clear()
+    assert local.invalidated_since((6, "2026-02"), generation)
+
+
+def test_summary_served_from_local_cache_without_redis(client, auth_headers, test_category, create_transaction):
+    create_transaction(test_category.id, 25.50)
+
+    before = client.get("/health/cache").json()
+    client.get("/summary/monthly/2026-02", headers=auth_headers)
+    client.get("/summary/monthly/2026-02", headers=auth_headers)
+    after = client.get("/health/cache").json()
+
+    assert after["redis_available"] is False
+    assert after["l1"]["hits"] == before["l1"]["hits"] + 1
+    assert after["l1"]["misses"] == before["l1"]["misses"] + 1
+
+    create_transaction(test_category.id, 10.00)
+
+    assert client.get("/summary/monthly/2026-02", headers=auth_headers).json()["total_spent"] == 35.50
+
+
+def test_invalidation_from_another_worker_evicts_local_entry(
+    fake_redis, client, auth_headers, test_user, test_category
+):
+    client.get("/summary/monthly/2026-02", headers=auth_headers)
+    assert cache.local_cache.get((test_user.id, "2026-02")) is not None
+
+    message = json.dumps({
+        "origin": "another-worker", "kind": "summary", "user_id": test_user.id, "months": ["2026-02"],
+    })
+    deadline = time.monotonic() + 2
+    while cache.local_cache.get((test_user.id, "2026-02")) is not None:
+        assert time.monotonic() < deadline
+        client.portal.call(fake_redis.publish, cache.INVALIDATION_CHANNEL, message)
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    """A fake Redis that starts out down; set `connected` to bring it up. Request before `client`."""
+    server = fakeredis.FakeServer()
+    server.connected = False
+    monkeypatch.setattr(cache, "redis_client", fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(cache, "REDIS_RETRY_INTERVAL", 0.05)
+    return server
+
+
+def test_worker_reconnects_when_redis_comes_back(redis_server, client, auth_headers, test_user):
+    assert client.get("/health/cache").json()["redis_available"] is False
+    client.get("/summary/monthly/2026-02", headers=auth_headers)
+    assert cache.local_cache.get((test_user.id, "2026-02")) is not None
+
+    redis_server.connected = True
+    deadline = time.monotonic() + 2
+    while not client.get("/health/cache").json()["redis_available"]:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+    # Entries cached while cut off from other workers are dropped, and
+    # summaries go to Redis again.
+    assert cache.local_cache.get((test_user.id, "2026-02")) is None
+    client.get("/summary/monthly/2026-02", headers=auth_headers)
+    assert client.portal.call(cache.redis_client.keys, "summary:*")
@@ -1,3 +1,10 @@
+from datetime import date
+
+from app import models
+from app.aggregates import verify_totals
+from app.config import settings
+
+
 def test_create_category(client, auth_headers):
     response = client.post("/categories/", json={
         "name": "Food",
@@ -64,4 +71,70 @@ def test_delete_category(client, auth_headers, test_category):
 def test_category_requires_auth(client):
     response = client.get("/categories/")
 
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+
+def test_delete_category_removes_transactions(client, auth_headers, test_category):
+    create_response = client.post("/transactions/", json={
+        "amount": 25.50,
+        "description": "Groceries",
+        "date": "2026-02-07",
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+    transaction_id = create_response.json()["id"]
+
+    response = client.delete(f"/categories/{test_category.id}", headers=auth_headers)
+    assert response.status_code == 204
+
+    response = client.get(f"/transactions/{transaction_id}", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_delete_category_cascades_in_the_database(
+    client, db_session, auth_headers, test_category, query_budget, create_transaction
+):
+    for _ in range(3):
+        create_transaction(test_category.id)
+    client.post("/budgets/", json={
+        "month": "2026-02", "limit_amount": 100, "category_id": test_category.id,
+    }, headers=auth_headers)
+
+    # Find the category, check its size, one DELETE.
+    with query_budget(3):
+        response = client.delete(f"/categories/{test_category.id}", headers=auth_headers)
+
+    assert response.status_code == 204
+    for model in (models.Transaction, models.Budget, models.MonthlyCategoryTotal):
+        assert db_session.query(model).count() == 0
+    assert client.get("/transactions/", params={"q": "groceries"}, headers=auth_headers).json()["items"] == []
+
+
+def test_delete_large_category_in_background(
+    monkeypatch, client, db_session, auth_headers, test_category, create_transaction
+):
+    monkeypatch.setattr(settings, "DELETE_BATCH_SIZE", 2)
+    other = client.post("/categories/", json={"name": "Rent", "type": "expense"}, headers=auth_headers).json()
+    for _ in range(5):
+        create_transaction(test_category.id)
+    create_transaction(other["id"])
+
+    response = client.delete(f"/categories/{test_category.id}", headers=auth_headers)
+
+    # The TestClient runs background tasks before returning.
+    assert response.status_code == 202
+    assert client.get(f"/categories/{test_category.id}", headers=auth_headers).status_code == 404
+    assert [t.category_id for t in db_session.query(models.Transaction)] == [other["id"]]
+    assert verify_totals(db_session) == []
+    summary = client.get("/summary/monthly/2026-02", headers=auth_headers).json()
+    assert summary["total_spent"] == 10
+
+
+def test_deleting_user_cascades(db_session, test_user, test_category):
+    db_session.add(models.Transaction(amount=5, date=date(2026, 2, 1), category_id=test_category.id, user_id=test_user.id))
+    db_session.commit()
+
+    db_session.delete(test_user)
+    db_session.commit()
+
+    assert db_session.query(models.Category).count() == 0
+    assert db_session.query(models.Transaction).count() == 0
@@ -0,0 +1,138 @@
+import pytest
+from starlette.requests import Request
+
+from app.cache import local_cache
+from app.config import settings
+from app.etags import etag_matches
+
+
+
+def _conditional_get(client, auth_headers, path, etag):
+    return client.get(path, headers={**auth_headers, "If-None-Match": etag})
+
+
+@pytest.mark.parametrize("header,matches", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"xyz"', False),
+    ("abc", False),
+])
+def test_etag_matching(header, matches):
+    request = Request({"type": "http", "headers": [(b"if-none-match", header.encode())]})
+    assert etag_matches(request, '"abc"') is matches
+
+
+def test_summary_not_modified_without_queries(client, auth_headers, test_category, query_budget, create_transaction):
+    create_transaction(test_category.id, 25.50)
+    first = client.get("/summary/monthly/2026-02", headers=auth_headers)
+    etag = first.headers["etag"]
+
+    with query_budget(0):
+        response = _conditional_get(client, auth_headers, "/summary/monthly/2026-02", etag)
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_summary_etag_changes_with_data(client, auth_headers, test_category, create_transaction):
+    create_transaction(test_category.id, 25.50)
+    etag = client.get("/summary/monthly/2026-02", headers=auth_headers).headers["etag"]
+
+    create_transaction(test_category.id, 10.00)
+    response = _conditional_get(client, auth_headers, "/summary/monthly/2026-02", etag)
+
+    assert response.status_code == 200
+    assert response.json()["total_spent"] == 35.50
+    assert response.headers["etag"] != etag
+
+
+def test_summary_etag_stable_across_workers(fake_redis, client, auth_headers, test_category, create_transaction):
+    create_transaction(test_category.id, 25.50)
+    etag = client.get("/summary/monthly/2026-02", headers=auth_headers).headers["etag"]
+
+    # Another worker finds the entry in Redis, not in its local cache.
+    local_cache.clear()
+    response = _conditional_get(client, auth_headers, "/summary/monthly/2026-02", etag)
+
+    assert response.status_code == 304
+
+
+def test_summary_range_not_modified(client, auth_headers, test_category, query_budget, create_transaction):
+    path = "/summary/range?from=2026-01&to=2026-03"
+    etag = client.get(path, headers=auth_headers).headers["etag"]
+
+    with query_budget(0):
+        assert _conditional_get(client, auth_headers, path, etag).status_code == 304
+
+    create_transaction(test_category.id, 25.50)
+    assert _conditional_get(client, auth_headers, path, etag).status_code == 200
+
+
+def test_categories_not_modified_from_redis_alone(fake_redis, client, auth_headers, test_category, query_budget):
+    first = client.get("/categories/", headers=auth_headers)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    with query_budget(0, redis_calls=1):
+        response = _conditional_get(client, auth_headers, "/categories/", etag)
+
+    assert response.status_code == 304
+
+
+def test_category_write_retires_etag(fake_redis, client, auth_headers, test_category):
+    etag = client.get("/categories/", headers=auth_headers).headers["etag"]
+
+    client.post("/categories/", json={"name": "Rent", "type": "expense"}, headers=auth_headers)
+    response = _conditional_get(client, auth_headers, "/categories/", etag)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["etag"] != etag
+
+
+def test_transactions_etag(fake_redis, client, auth_headers, test_category, create_transaction):
+    create_transaction(test_category.id, 25.50)
+    etag = client.get("/transactions/", headers=auth_headers).headers["etag"]
+    assert _conditional_get(client, auth_headers, "/transactions/", etag).status_code == 304
+
+    create_transaction(test_category.id, 10.00)
+    response = _conditional_get(client, auth_headers, "/transactions/", etag)
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+
+
+def test_category_delete_retires_transactions_etag(fake_redis, client, auth_headers, test_category, create_transaction):
+    create_transaction(test_category.id, 25.50)
+    etag = client.get("/transactions/", headers=auth_headers).headers["etag"]
+
+    client.delete(f"/categories/{test_category.id}", headers=auth_headers)
+    response = _conditional_get(client, auth_headers, "/transactions/", etag)
+
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+
+def test_expired_version_never_reuses_an_etag(fake_redis, client, auth_headers, test_user, test_category):
+    etag = client.get("/categories/", headers=auth_headers).headers["etag"]
+
+    client.portal.call(fake_redis.delete, f"collection_version:{test_user.id}:categories")
+
+    assert client.get("/categories/", headers=auth_headers).headers["etag"] != etag
+
+
+def test_lists_untagged_without_redis(client, auth_headers, test_category):
+    # A version held by one worker alone could hide another worker's writes.
+    assert "etag" not in client.get("/categories/", headers=auth_headers).headers
+    assert "etag" not in client.get("/transactions/", headers=auth_headers).headers
+
+
+def test_fast_responses_carry_etags(monkeypatch, fake_redis, client, auth_headers, test_category):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+
+    for path in ("/categories/", "/transactions/", "/summary/monthly/2026-02"):
+        etag = client.get(path, headers=auth_headers).headers["etag"]
+        assert _conditional_get(client, auth_headers, path, etag).status_code == 304
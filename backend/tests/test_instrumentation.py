@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+
+from app.config import settings
+
+# Most endpoints need one statement: the principal is cached at login.
+QUERY_BUDGETS = [
+    ("/transactions/", 1),
+    ("/categories/", 1),
+    ("/budgets/", 1),
+    ("/alerts/", 1),
+    ("/summary/monthly/2026-02", 1),
+    ("/summary/range?from=2025-03&to=2026-02", 1),
+    ("/summary/alerts/2026-02", 1),
+]
+
+
+@pytest.mark.parametrize("path,queries", QUERY_BUDGETS)
+def test_endpoint_query_budget(client, auth_headers, test_category, query_budget, path, queries):
+    with query_budget(queries):
+        response = client.get(path, headers=auth_headers)
+
+    assert response.status_code == 200
+
+
+def test_query_budget_catches_overruns(client, auth_headers, query_budget):
+    with pytest.raises(AssertionError, match="ran 1 queries, budget is 0"):
+        with query_budget(0):
+            client.get("/categories/", headers=auth_headers)
+
+
+def test_server_timing_header(fake_redis, client, auth_headers, test_category):
+    response = client.get("/summary/monthly/2026-02", headers=auth_headers)
+
+    timing = response.headers["server-timing"]
+    assert 'db;desc="1 queries"' in timing
+    # Two MGETs for the lookup, one SETEX to store the result.
+    assert 'redis;desc="3 calls"' in timing
+    assert "app;dur=" in timing
+
+
+def test_server_timing_header_can_be_disabled(client, monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_HEADER", False)
+
+    response = client.get("/")
+
+    assert "server-timing" not in response.headers
+
+
+def test_slow_requests_are_logged(client, auth_headers, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_REQUEST_QUERIES", 0)
+
+    with caplog.at_level(logging.WARNING, logger="app.instrumentation"):
+        client.get("/categories/", headers=auth_headers)
+
+    assert "Slow request GET /categories/" in caplog.text
+    assert "1 queries" in caplog.text
@@ -0,0 +1,58 @@
+from prometheus_client import REGISTRY
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_exposes_prometheus_text(client, auth_headers):
+    client.get("/categories/", headers=auth_headers)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/categories/",status="200"}' in body
+    assert "db_statement_duration_seconds_bucket" in body
+    assert "db_pool_checkout_duration_seconds_count" in body
+    assert "cache_requests_total" in body
+
+
+def test_requests_labelled_by_route_template(client, auth_headers):
+    labels = {"method": "GET", "route": "/summary/monthly/{month}", "status": "200"}
+    before = _sample("http_requests_total", **labels)
+
+    client.get("/summary/monthly/2026-01", headers=auth_headers)
+    client.get("/summary/monthly/2026-02", headers=auth_headers)
+
+    assert _sample("http_requests_total", **labels) == before + 2
+    assert _sample("http_request_db_statements_count", route="/summary/monthly/{month}") >= 2
+
+
+def test_unmatched_routes_share_one_label(client):
+    labels = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = _sample("http_requests_total", **labels)
+
+    client.get("/no/such/page")
+    client.get("/another/missing/page")
+
+    assert _sample("http_requests_total", **labels) == before + 2
+
+
+def test_password_hashing_is_timed(client, test_user):
+    before = _sample("password_hash_duration_seconds_count", operation="verify")
+
+    response = client.post("/auth/login", json={"email": "testuser@example.com", "password": "testpassword123"})
+
+    assert response.status_code == 200
+    assert _sample("password_hash_duration_seconds_count", operation="verify") == before + 1
+    assert _sample("password_hash_wait_seconds_count", operation="verify") >= 1
+
+
+def test_cache_lookups_are_counted(client, auth_headers):
+    before = _sample("cache_requests_total", tier="l1", result="miss")
+
+    client.get("/summary/monthly/2026-02", headers=auth_headers)
+
+    assert _sample("cache_requests_total", tier="l1", result="miss") == before + 1
@@ -0,0 +1,36 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app.database import build_async_engine
+from app.metrics import pool_checkout_latency, pool_wait_time
+from tests.conftest import SQLALCHEMY_TEST_DATABASE_URL
+
+
+def test_pool_health(client):
+    response = client.get("/health/pool")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pool_class"] == "InstrumentedAsyncQueuePool"
+    assert data["size"] == 5
+    for key in ("checkedout", "overflow", "checkout_timeouts"):
+        assert key in data
+    assert "count" in data["checkout_latency_seconds"]
+    assert "buckets" in data["wait_time_seconds"]
+
+
+def test_pool_records_checkout_timings():
+    engine = build_async_engine(SQLALCHEMY_TEST_DATABASE_URL)
+    latency_before = pool_checkout_latency.snapshot()["count"]
+    wait_before = pool_wait_time.snapshot()["count"]
+
+    async def run():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    asyncio.run(run())
+
+    assert pool_checkout_latency.snapshot()["count"] == latency_before + 1
+    assert pool_wait_time.snapshot()["count"] == wait_before + 1
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from app import responses
+from app.config import settings
+
+
+@pytest.fixture
+def seeded(client, auth_headers, test_category, test_income_category):
+    for day in range(1, 8):
+        client.post("/transactions/", json={
+            "amount": 10.25 * day,
+            "description": f"Purchase {day}" if day % 2 else None,
+            "date": f"2026-02-{day:02d}",
+            "category_id": test_category.id,
+        }, headers=auth_headers)
+    client.post("/budgets/", json={
+        "month": "2026-02",
+        "limit_amount": 100.00,
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+
+
+PATHS = [
+    "/transactions/?limit=3",
+    "/categories/",
+    "/budgets/",
+    "/budgets/?month=2026-02",
+    "/summary/monthly/2026-02",
+    "/summary/range?from=2026-01&to=2026-03",
+]
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_fast_json_matches_default(client, auth_headers, seeded, monkeypatch, path):
+    # Small stream chunks exercise the separators between them.
+    monkeypatch.setattr(responses, "STREAM_BATCH_SIZE", 1)
+
+    default = client.get(path, headers=auth_headers)
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast = client.get(path, headers=auth_headers)
+
+    assert fast.status_code == default.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert json.loads(fast.content) == default.json()
+
+
+def test_fast_json_cursor_pagination(client, auth_headers, seeded, monkeypatch):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+
+    first = client.get("/transactions/?limit=4", headers=auth_headers).json()
+    second = client.get(f"/transactions/?limit=4&cursor={first['next_cursor']}", headers=auth_headers).json()
+
+    assert [t["date"] for t in first["items"] + second["items"]] == [f"2026-02-{d:02d}" for d in range(7, 0, -1)]
+    assert second["next_cursor"] is None
+
+
+def test_fast_json_empty_stream(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+
+    response = client.get("/budgets/", headers=auth_headers)
+
+    assert response.json() == []
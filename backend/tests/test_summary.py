@@ -1,3 +1,9 @@
+from datetime import date
+
+from app import models
+from app.aggregates import rebuild_totals
+
+
 def test_monthly_summary(client, auth_headers, test_category, test_income_category):
     client.post("/transactions/", json={
         "amount": 25.50,
@@ -35,6 +41,20 @@ def test_monthly_summary(client, auth_headers, test_category, test_income_catego
     assert food["status"] == "under_budget"
 
 
+def test_monthly_summary_sums_exactly(client, auth_headers, test_category):
+    for amount in (0.10, 0.20, 19.99, 0.01):
+        client.post("/transactions/", json={
+            "amount": amount,
+            "date": "2026-02-07",
+            "category_id": test_category.id,
+        }, headers=auth_headers)
+
+    data = client.get("/summary/monthly/2026-02", headers=auth_headers).json()
+
+    assert data["total_spent"] == 20.30
+    assert data["net"] == -20.30
+
+
 def test_monthly_summary_invalid_format(client, auth_headers):
     response = client.get("/summary/monthly/February", headers=auth_headers)
 
@@ -116,4 +136,91 @@ def test_alerts_over_budget(client, auth_headers, test_category, test_income_cat
 def test_summary_requires_auth(client):
     response = client.get("/summary/monthly/2026-02")
 
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+
+def test_monthly_summary_query_count_is_constant(client, auth_headers, db_session, test_user, query_budget):
+    def add_categories(count):
+        for i in range(count):
+            category = models.Category(name=f"Category {i}", type="expense", user_id=test_user.id)
+            db_session.add(category)
+            db_session.flush()
+            db_session.add(models.Budget(
+                month="2026-02", limit_amount=100.0, category_id=category.id, user_id=test_user.id,
+            ))
+            db_session.add(models.Budget(
+                month="2026-03", limit_amount=100.0, category_id=category.id, user_id=test_user.id,
+            ))
+            db_session.add(models.Transaction(
+                amount=10.0, date=date(2026, 2, 1), category_id=category.id, user_id=test_user.id,
+            ))
+            db_session.add(models.Transaction(
+                amount=10.0, date=date(2026, 3, 1), category_id=category.id, user_id=test_user.id,
+            ))
+        db_session.commit()
+
+    # The principal was cached at login, so only the summary query runs,
+    # however many categories there are.
+    add_categories(2)
+    with query_budget(1):
+        assert client.get("/summary/monthly/2026-02", headers=auth_headers).status_code == 200
+
+    add_categories(60)
+    with query_budget(1):
+        assert client.get("/summary/monthly/2026-03", headers=auth_headers).status_code == 200
+
+
+def test_summary_range_matches_monthly(client, auth_headers, test_category, test_income_category):
+    client.post("/budgets/", json={
+        "month": "2026-02",
+        "limit_amount": 100.00,
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+    client.post("/transactions/", json={
+        "amount": 85.00,
+        "date": "2026-02-07",
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+    client.post("/transactions/", json={
+        "amount": 3000.00,
+        "date": "2026-03-01",
+        "category_id": test_income_category.id,
+    }, headers=auth_headers)
+
+    response = client.get("/summary/range?from=2026-01&to=2026-04", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["from"] == "2026-01"
+    assert data["to"] == "2026-04"
+    assert [m["month"] for m in data["months"]] == ["2026-01", "2026-02", "2026-03", "2026-04"]
+    for summary in data["months"]:
+        monthly = client.get(f"/summary/monthly/{summary['month']}", headers=auth_headers).json()
+        assert summary == monthly
+
+    february = data["months"][1]
+    assert february["categories"][0]["status"] == "near_limit"
+    assert data["months"][2]["total_income"] == 3000.00
+
+
+def test_summary_range_invalid(client, auth_headers):
+    for query in ("from=2026-05&to=2026-04", "from=May&to=2026-04", "from=2020-01&to=2026-01"):
+        response = client.get(f"/summary/range?{query}", headers=auth_headers)
+        assert response.status_code == 400
+
+
+def test_summary_range_is_one_query(client, auth_headers, db_session, test_user, test_category, query_budget):
+    for month in range(1, 13):
+        db_session.add(models.Transaction(
+            amount=10.0, date=date(2025, month, 1), category_id=test_category.id, user_id=test_user.id,
+        ))
+        db_session.add(models.Budget(
+            month=f"2025-{month:02d}", limit_amount=100.0, category_id=test_category.id, user_id=test_user.id,
+        ))
+    db_session.commit()
+
+    rebuild_totals(db_session)
+
+    with query_budget(1):
+        response = client.get("/summary/range?from=2024-01&to=2025-12", headers=auth_headers)
+    assert response.status_code == 200
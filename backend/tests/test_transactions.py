@@ -1,3 +1,9 @@
+import json
+from datetime import date
+
+from app import models
+
+
 def test_create_transaction(client, auth_headers, test_category):
     response = client.post("/transactions/", json={
         "amount": 25.50,
@@ -13,6 +19,18 @@ def test_create_transaction(client, auth_headers, test_category):
     assert data["category_id"] == test_category.id
 
 
+def test_create_transaction_stores_cents(client, db_session, auth_headers, test_category):
+    response = client.post("/transactions/", json={
+        "amount": 19.99,
+        "date": "2026-02-07",
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+
+    assert response.json()["amount"] == 19.99
+    transaction = db_session.get(models.Transaction, response.json()["id"])
+    assert transaction.amount_cents == 1999
+
+
 def test_create_transaction_invalid_category(client, auth_headers):
     response = client.post("/transactions/", json={
         "amount": 25.50,
@@ -43,7 +61,8 @@ def test_get_transactions(client, auth_headers, test_category):
 
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 2
+    assert len(data["items"]) == 2
+    assert data["next_cursor"] is None
 
 
 def test_get_transactions_filter_by_category(client, auth_headers, test_category, test_income_category):
@@ -64,7 +83,7 @@ def test_get_transactions_filter_by_category(client, auth_headers, test_category
     response = client.get(f"/transactions/?category_id={test_category.id}", headers=auth_headers)
 
     assert response.status_code == 200
-    data = response.json()
+    data = response.json()["items"]
     assert len(data) == 1
     assert data[0]["description"] == "Groceries"
 
@@ -89,6 +108,55 @@ def test_update_transaction(client, auth_headers, test_category):
     assert response.json()["description"] == "Groceries (updated)"
 
 
+def test_update_transaction_rejects_null_required_fields(client, auth_headers, test_category):
+    transaction_id = client.post("/transactions/", json={
+        "amount": 25.50,
+        "date": "2026-02-07",
+        "category_id": test_category.id,
+    }, headers=auth_headers).json()["id"]
+
+    for field in ("amount", "date", "category_id"):
+        response = client.put(f"/transactions/{transaction_id}", json={field: None}, headers=auth_headers)
+        assert response.status_code == 422
+        assert response.json()["detail"] == f"{field} cannot be null"
+
+    # description is optional, so it can be cleared.
+    response = client.put(f"/transactions/{transaction_id}", json={"description": None}, headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_transaction_amount_must_be_finite_and_fit(client, auth_headers, test_category):
+    for amount in (1e30, -1e30):
+        response = client.post("/transactions/", json={
+            "amount": amount,
+            "date": "2026-02-07",
+            "category_id": test_category.id,
+        }, headers=auth_headers)
+        assert response.status_code == 422
+
+    response = client.post("/transactions/batch", json={"operations": [
+        {"op": "create", "amount": 1e30, "date": "2026-02-07", "category_id": test_category.id},
+    ]}, headers=auth_headers)
+    assert response.status_code == 422
+
+    content = (
+        "amount,description,date,category_id\n"
+        f"nan,Broken,2026-02-07,{test_category.id}\n"
+        f"inf,Broken,2026-02-07,{test_category.id}\n"
+        f"1e30,Broken,2026-02-07,{test_category.id}\n"
+        f"12.00,Fine,2026-02-07,{test_category.id}\n"
+    )
+    response = client.post(
+        "/transactions/import",
+        files={"file": ("statement.csv", content, "text/csv")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 1
+    assert [e["row"] for e in data["errors"]] == [1, 2, 3]
+
+
 def test_delete_transaction(client, auth_headers, test_category):
     create_response = client.post("/transactions/", json={
         "amount": 25.50,
@@ -109,4 +177,395 @@ def test_delete_transaction(client, auth_headers, test_category):
 def test_transaction_requires_auth(client):
     response = client.get("/transactions/")
 
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+
+def test_get_transactions_filter_by_month(client, auth_headers, test_category):
+    for day in ("2026-01-31", "2026-02-01", "2026-02-28", "2026-03-01"):
+        client.post("/transactions/", json={
+            "amount": 10.00,
+            "description": day,
+            "date": day,
+            "category_id": test_category.id,
+        }, headers=auth_headers)
+
+    response = client.get("/transactions/?month=2026-02", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()["items"]
+    assert sorted(t["description"] for t in data) == ["2026-02-01", "2026-02-28"]
+
+
+def test_get_transactions_invalid_month(client, auth_headers):
+    response = client.get("/transactions/?month=February", headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_get_transactions_cursor_pagination(client, auth_headers, test_category):
+    for day in ("2026-02-01", "2026-02-01", "2026-02-02", "2026-02-03", "2026-02-03"):
+        client.post("/transactions/", json={
+            "amount": 10.00,
+            "description": day,
+            "date": day,
+            "category_id": test_category.id,
+        }, headers=auth_headers)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/transactions/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(data["items"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len({t["id"] for t in seen}) == 5
+    keys = [(t["date"], t["id"]) for t in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_get_transactions_invalid_cursor(client, auth_headers):
+    response = client.get("/transactions/?cursor=not-a-cursor", headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_import_transactions_csv(client, auth_headers, test_category):
+    content = (
+        "amount,description,date,category_id\n"
+        f"25.50,Groceries,2026-02-07,{test_category.id}\n"
+        f"not-a-number,Broken,2026-02-07,{test_category.id}\n"
+        "10.00,Elsewhere,2026-02-08,999\n"
+        f"15.00,,2026-02-09,{test_category.id}\n"
+    )
+
+    response = client.post(
+        "/transactions/import",
+        files={"file": ("statement.csv", content, "text/csv")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 2
+    assert [e["row"] for e in data["errors"]] == [2, 3]
+    assert data["errors"][1]["error"] == "Category not found"
+
+    items = client.get("/transactions/", headers=auth_headers).json()["items"]
+    assert sorted(t["amount"] for t in items) == [15.00, 25.50]
+
+
+def test_import_transactions_ndjson(client, auth_headers, test_category):
+    content = "\n".join([
+        f'{{"amount": 25.50, "description": "Groceries", "date": "2026-02-07", "category_id": {test_category.id}}}',
+        "{not json",
+        f'{{"amount": 5.00, "date": "2026-02-08", "category_id": {test_category.id}}}',
+    ])
+
+    response = client.post(
+        "/transactions/import?format=ndjson",
+        files={"file": ("statement.txt", content, "application/octet-stream")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 2
+    assert [e["row"] for e in data["errors"]] == [2]
+
+
+def test_import_transactions_unknown_format(client, auth_headers):
+    response = client.post(
+        "/transactions/import",
+        files={"file": ("statement.bin", b"", "application/octet-stream")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 400
+
+
+def test_import_transactions_rejects_non_utf8(client, auth_headers, test_category):
+    csv_content = (
+        "amount,description,date,category_id\n"
+        f"12.50,Cafe,2026-02-07,{test_category.id}\n"
+        f"4.20,Caf\u00e9 cr\u00e8me,2026-02-08,{test_category.id}\n"
+    ).encode("latin-1")
+
+    response = client.post(
+        "/transactions/import",
+        files={"file": ("statement.csv", csv_content, "text/csv")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 400
+    assert "UTF-8" in response.json()["detail"]
+    assert client.get("/transactions/", headers=auth_headers).json()["items"] == []
+
+
+def test_export_transactions_csv(client, auth_headers, test_category):
+    for day in ("2026-01-31", "2026-02-01", "2026-02-02"):
+        client.post("/transactions/", json={
+            "amount": 10.00,
+            "description": day,
+            "date": day,
+            "category_id": test_category.id,
+        }, headers=auth_headers)
+
+    response = client.get("/transactions/export?format=csv&month=2026-02", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.strip().splitlines()
+    assert lines[0] == "id,amount,description,date,category_id"
+    assert [line.split(",")[3] for line in lines[1:]] == ["2026-02-02", "2026-02-01"]
+
+
+def test_export_transactions_ndjson(client, auth_headers, test_category):
+    client.post("/transactions/", json={
+        "amount": 25.50,
+        "description": "Groceries",
+        "date": "2026-02-07",
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+
+    response = client.get("/transactions/export?format=ndjson", headers=auth_headers)
+
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == 1
+    assert records[0]["amount"] == 25.50
+    assert records[0]["date"] == "2026-02-07"
+
+
+def test_update_transaction_date(client, auth_headers, test_category):
+    create_response = client.post("/transactions/", json={
+        "amount": 25.50,
+        "description": "Groceries",
+        "date": "2026-02-07",
+        "category_id": test_category.id,
+    }, headers=auth_headers)
+
+    transaction_id = create_response.json()["id"]
+
+    response = client.put(f"/transactions/{transaction_id}", json={
+        "date": "2026-03-02",
+    }, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["date"] == "2026-03-02"
+
+
+def test_batch_transactions(client, auth_headers, test_category, test_income_category, create_transaction):
+    to_update = create_transaction(test_category.id, 10.00)
+    to_delete = create_transaction(test_category.id, 5.00)
+
+    response = client.post("/transactions/batch", json={"operations": [
+        {"op": "create", "amount": 25.50, "date": "2026-02-08", "category_id": test_category.id},
+        {"op": "create", "amount": 3000, "date": "2026-02-01", "category_id": test_income_category.id},
+        {"op": "update", "id": to_update, "amount": 12.25, "date": "2026-03-01"},
+        {"op": "delete", "id": to_delete},
+    ]}, headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["applied"] == 4
+    assert data["failed"] == 0
+    created = data["results"][0]["transaction"]
+    assert created["id"] == data["results"][0]["id"]
+    assert created["amount"] == 25.50
+    assert data["results"][1]["id"] != created["id"]
+    assert data["results"][2]["transaction"]["date"] == "2026-03-01"
+    assert data["results"][3] == {
+        "index": 3, "op": "delete", "status": "ok", "id": to_delete, "transaction": None, "error": None,
+    }
+
+    items = client.get("/transactions/", headers=auth_headers).json()["items"]
+    assert sorted(item["amount"] for item in items) == [12.25, 25.50, 3000]
+    february = client.get("/summary/monthly/2026-02", headers=auth_headers).json()
+    assert february["total_spent"] == 25.50
+    assert february["total_income"] == 3000
+    march = client.get("/summary/monthly/2026-03", headers=auth_headers).json()
+    assert march["total_spent"] == 12.25
+
+
+def test_batch_transactions_reports_failures(client, auth_headers, test_category, create_transaction):
+    existing = create_transaction(test_category.id, 10.00)
+
+    response = client.post("/transactions/batch", json={"operations": [
+        {"op": "create", "amount": 1, "date": "2026-02-08", "category_id": 99999},
+        {"op": "update", "id": 99999, "amount": 1},
+        {"op": "delete", "id": existing},
+        {"op": "update", "id": existing, "amount": 1},
+        {"op": "create", "amount": 2, "date": "2026-02-08", "category_id": test_category.id},
+    ]}, headers=auth_headers)
+
+    data = response.json()
+    assert data["applied"] == 2
+    assert [(r["status"], r["error"]) for r in data["results"]] == [
+        ("error", "Category not found"),
+        ("error", "Transaction not found"),
+        ("ok", None),
+        ("error", "Transaction not found"),
+        ("ok", None),
+    ]
+    items = client.get("/transactions/", headers=auth_headers).json()["items"]
+    assert [item["amount"] for item in items] == [2]
+
+
+def test_batch_transactions_cannot_touch_other_users(client, auth_headers, db_session, test_user):
+    other = models.User(email="other@example.com", hashed_password="x")
+    db_session.add(other)
+    db_session.commit()
+    category = models.Category(name="Theirs", type="expense", user_id=other.id)
+    db_session.add(category)
+    db_session.commit()
+    theirs = models.Transaction(amount=5, date=date(2026, 2, 1), category_id=category.id, user_id=other.id)
+    db_session.add(theirs)
+    db_session.commit()
+
+    data = client.post("/transactions/batch", json={"operations": [
+        {"op": "delete", "id": theirs.id},
+        {"op": "create", "amount": 1, "date": "2026-02-08", "category_id": category.id},
+    ]}, headers=auth_headers).json()
+
+    assert data["applied"] == 0
+    db_session.expire_all()
+    assert db_session.get(models.Transaction, theirs.id) is not None
+
+
+def test_batch_transactions_query_budget(client, auth_headers, test_category, query_budget, create_transaction):
+    ids = [create_transaction(test_category.id, amount) for amount in (1, 2, 3, 4)]
+    operations = [
+        {"op": "create", "amount": n, "date": "2026-02-08", "category_id": test_category.id}
+        for n in range(20)
+    ]
+    operations += [{"op": "update", "id": i, "amount": 9} for i in ids[:2]]
+    operations += [{"op": "delete", "id": i} for i in ids[2:]]
+
+    # Select transactions, select categories, insert, update, delete, totals.
+    with query_budget(6):
+        response = client.post("/transactions/batch", json={"operations": operations}, headers=auth_headers)
+
+    assert response.json()["applied"] == 24
+
+
+def test_batch_transactions_validates_operations(client, auth_headers):
+    response = client.post("/transactions/batch", json={"operations": [
+        {"op": "rename", "id": 1},
+    ]}, headers=auth_headers)
+    assert response.status_code == 422
+
+    response = client.post("/transactions/batch", json={"operations": []}, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def _search(client, auth_headers, q, **params):
+    return client.get("/transactions/", params={"q": q, **params}, headers=auth_headers)
+
+
+def test_search_transactions(client, auth_headers, test_category, create_transaction):
+    for description in ("Corner shop", "Coffee shop downtown", "Bookshop", "Rent", None):
+        create_transaction(test_category.id, description=description)
+
+    response = _search(client, auth_headers, "SHOP")
+
+    assert response.status_code == 200
+    descriptions = [item["description"] for item in response.json()["items"]]
+    assert sorted(descriptions) == ["Bookshop", "Coffee shop downtown", "Corner shop"]
+
+
+def test_search_ranks_closer_matches_first(client, auth_headers, test_category, create_transaction):
+    create_transaction(test_category.id, description="Coffee", date="2026-02-01")
+    create_transaction(
+        test_category.id, description="Airport lounge snacks, magazines and a coffee", date="2026-02-09",
+    )
+
+    items = _search(client, auth_headers, "coffee").json()["items"]
+
+    assert [item["description"] for item in items][0] == "Coffee"
+
+
+def test_search_follows_updates_and_deletes(client, auth_headers, test_category, create_transaction):
+    renamed = create_transaction(test_category.id, description="Taxi")
+    deleted = create_transaction(test_category.id, description="Taxi home")
+
+    client.put(f"/transactions/{renamed}", json={"description": "Train ticket"}, headers=auth_headers)
+    client.delete(f"/transactions/{deleted}", headers=auth_headers)
+
+    assert _search(client, auth_headers, "taxi").json()["items"] == []
+    assert [item["id"] for item in _search(client, auth_headers, "ticket").json()["items"]] == [renamed]
+
+
+def test_search_covers_bulk_writes(client, auth_headers, test_category):
+    client.post("/transactions/batch", json={"operations": [
+        {"op": "create", "amount": 5, "description": "Farmers market", "date": "2026-02-08",
+         "category_id": test_category.id},
+    ]}, headers=auth_headers)
+
+    assert len(_search(client, auth_headers, "market").json()["items"]) == 1
+
+
+def test_search_treats_query_literally(client, auth_headers, test_category, create_transaction):
+    create_transaction(test_category.id, description='Dinner "50% off"')
+    create_transaction(test_category.id, description="Dinner out")
+
+    for q in ('"50% off"', "50%", "%"):
+        items = _search(client, auth_headers, q).json()["items"]
+        assert [item["description"] for item in items] == ['Dinner "50% off"'], q
+    assert _search(client, auth_headers, "_").json()["items"] == []
+
+
+def test_search_short_query(client, auth_headers, test_category, create_transaction):
+    create_transaction(test_category.id, description="Gym")
+    create_transaction(test_category.id, description="Rent")
+
+    items = _search(client, auth_headers, "gy").json()["items"]
+
+    assert [item["description"] for item in items] == ["Gym"]
+
+
+def test_search_pagination(client, auth_headers, test_category, create_transaction):
+    for day in range(1, 6):
+        create_transaction(test_category.id, description="Lunch", date=f"2026-02-0{day}")
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        page = _search(client, auth_headers, "lunch", **params).json()
+        seen += [item["date"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # Equally relevant matches come newest first.
+    assert seen == [f"2026-02-0{day}" for day in range(5, 0, -1)]
+
+
+def test_search_is_per_user(client, auth_headers, db_session, test_category):
+    other = models.User(email="other@example.com", hashed_password="x")
+    db_session.add(other)
+    db_session.commit()
+    category = models.Category(name="Theirs", type="expense", user_id=other.id)
+    db_session.add(category)
+    db_session.commit()
+    db_session.add(models.Transaction(
+        amount=5, description="Secret shop", date=date(2026, 2, 1), category_id=category.id, user_id=other.id,
+    ))
+    db_session.commit()
+
+    assert _search(client, auth_headers, "secret").json()["items"] == []
+
+
+def test_search_invalid_cursor(client, auth_headers):
+    response = _search(client, auth_headers, "shop", cursor="MjAyNi0wMi0wNzox")
+    assert response.status_code == 400
@@ -1,10 +1,13 @@
 import client from "./client";
-import type { Transaction } from "../types";
+import type { Transaction, TransactionPage } from "../types";
 
 export const getTransactions = async (params?: {
   category_id?: number;
   month?: string;
-}): Promise<Transaction[]> => {
+  q?: string;
+  cursor?: string;
+  limit?: number;
+}): Promise<TransactionPage> => {
   const response = await client.get("/transactions/", { params });
   return response.data;
 };
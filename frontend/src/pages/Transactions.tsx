@@ -1,5 +1,11 @@
-import { useState } from "react";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useEffect, useState } from "react";
+import {
+  useQuery,
+  useInfiniteQuery,
+  useMutation,
+  useQueryClient,
+  keepPreviousData,
+} from "@tanstack/react-query";
 import { Plus, Pencil, Trash2, ArrowUpRight, ArrowDownRight, Search } from "lucide-react";
 import {
   getTransactions,
@@ -17,11 +23,15 @@ import Select from "../components/ui/Select";
 import Modal from "../components/ui/Modal";
 import EmptyState from "../components/ui/EmptyState";
 
+// How long typing has to pause before the search goes to the server.
+const SEARCH_DEBOUNCE_MS = 300;
+
 export default function Transactions() {
   const queryClient = useQueryClient();
   const [month, setMonth] = useState(getCurrentMonth());
   const [categoryFilter, setCategoryFilter] = useState("");
   const [searchQuery, setSearchQuery] = useState("");
+  const [search, setSearch] = useState("");
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [editingTransaction, setEditingTransaction] = useState<Transaction | null>(null);
 
@@ -31,15 +41,34 @@ export default function Transactions() {
   const [formCategoryId, setFormCategoryId] = useState("");
   const [formError, setFormError] = useState("");
 
-  const { data: transactions = [], isLoading } = useQuery({
-    queryKey: ["transactions", month, categoryFilter],
-    queryFn: () =>
+  useEffect(() => {
+    const timer = setTimeout(() => setSearch(searchQuery.trim()), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
+
+  const {
+    data: transactionPages,
+    isLoading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
+    queryKey: ["transactions", month, categoryFilter, search],
+    queryFn: ({ pageParam }) =>
       getTransactions({
         month: month || undefined,
         category_id: categoryFilter ? Number(categoryFilter) : undefined,
+        q: search || undefined,
+        cursor: pageParam,
       }),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    // Keep showing the last results while the next search loads.
+    placeholderData: keepPreviousData,
   });
 
+  const transactions = transactionPages?.pages.flatMap((page) => page.items) ?? [];
+
   const { data: categories = [] } = useQuery({
     queryKey: ["categories"],
     queryFn: getCategories,
@@ -50,14 +79,6 @@ export default function Transactions() {
     return acc;
   }, {});
 
-  const filteredTransactions = transactions.filter((t) => {
-    if (!searchQuery) return true;
-    return (
-      t.description?.toLowerCase().includes(searchQuery.toLowerCase()) ||
-      formatCurrency(t.amount).includes(searchQuery)
-    );
-  });
-
   const createMutation = useMutation({
     mutationFn: createTransaction,
     onSuccess: () => {
@@ -174,7 +195,7 @@ export default function Transactions() {
             />
             <input
               type="text"
-              placeholder="Search transactions..."
+              placeholder="Search descriptions..."
               value={searchQuery}
               onChange={(e) => setSearchQuery(e.target.value)}
               className="w-full pl-9 pr-4 py-2 bg-bg-hover border border-border rounded-lg text-sm text-text-primary placeholder:text-text-muted outline-none focus:ring-2 focus:ring-accent/40"
@@ -200,7 +221,7 @@ export default function Transactions() {
           </select>
         </div>
 
-        {filteredTransactions.length === 0 ? (
+        {transactions.length === 0 ? (
           <EmptyState
             icon={<ArrowUpRight size={40} />}
             title="No transactions yet"
@@ -235,7 +256,7 @@ export default function Transactions() {
                 </tr>
               </thead>
               <tbody>
-                {filteredTransactions.map((transaction) => {
+                {transactions.map((transaction) => {
                   const category = categoryMap[transaction.category_id];
                   const isIncome = category?.type === "income";
 
@@ -299,6 +320,18 @@ export default function Transactions() {
                 })}
               </tbody>
             </table>
+            {hasNextPage && (
+              <div className="flex justify-center px-6 py-4">
+                <Button
+                  variant="secondary"
+                  size="sm"
+                  onClick={() => fetchNextPage()}
+                  isLoading={isFetchingNextPage}
+                >
+                  Load more
+                </Button>
+              </div>
+            )}
           </div>
         )}
       </Card>
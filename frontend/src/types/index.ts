@@ -24,6 +24,11 @@ export interface Transaction {
   user_id: number;
 }
 
+export interface TransactionPage {
+  items: Transaction[];
+  next_cursor: string | null;
+}
+
 export interface Budget {
   id: number;
   month: string;
@@ -51,6 +56,12 @@ export interface MonthlySummary {
   categories: CategorySummary[];
 }
 
+export interface SummaryRange {
+  from: string;
+  to: string;
+  months: MonthlySummary[];
+}
+
 export interface Alert {
   category: string;
   severity: "high" | "warning";